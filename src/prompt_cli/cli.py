@@ -6,9 +6,6 @@ import argparse
 import sys
 from pathlib import Path
 
-from prompt_cli.config.loader import load_config
-from prompt_cli.editor.prompt import edit_command_line
-
 
 def parse_args(args: list[str] | None = None) -> argparse.Namespace:
     """Parse command-line arguments.
@@ -19,6 +16,21 @@ def parse_args(args: list[str] | None = None) -> argparse.Namespace:
     Returns:
         Parsed arguments
     """
+    if args is None:
+        args = sys.argv[1:]
+
+    # Common case 'prompt -- <command line>': no options, so skip building the parser
+    if args and args[0] == "--":
+        return argparse.Namespace(
+            config=None,
+            config_dir=None,
+            theme=None,
+            granularity=None,
+            no_color=False,
+            print_result=False,
+            command=args[1:],
+        )
+
     parser = argparse.ArgumentParser(
         prog="prompt",
         description="Interactive command line editor with syntax highlighting",
@@ -104,6 +116,10 @@ def main(args: list[str] | None = None) -> int:
         print("Usage: prompt [options] -- <command line>", file=sys.stderr)
         return 1
 
+    # Deferred so --help/--version and usage errors skip the heavy imports
+    from prompt_cli.config.loader import load_config
+    from prompt_cli.editor.prompt import edit_command_line
+
     # Load configuration
     try:
         config = load_config(
@@ -116,7 +132,9 @@ def main(args: list[str] | None = None) -> int:
 
     # Override config options
     if parsed.no_color:
-        config.config.color = False
+        config = config.model_copy(
+            update={"config": config.config.model_copy(update={"color": False})}
+        )
 
     # Run editor
     try:
@@ -1,6 +1,8 @@
 """Default configuration values."""
 
-DEFAULT_CONFIG_YAML = """
+from __future__ import annotations
+
+DEFAULT_CONFIG_YAML = r"""
 config:
   color: true
   default_validator:
@@ -2,53 +2,307 @@
 
 from __future__ import annotations
 
+import codecs
+import hashlib
+import os
+import pickle
+import re
+import sys
+import tempfile
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
-
-import yaml
+from typing import Any, TypeVar
 
 from prompt_cli.config.schema import Config
 
 DEFAULT_CONFIG_PATH = Path.home() / ".config" / "prompt" / "config.yaml"
 DEFAULT_DROPIN_DIR = Path.home() / ".config" / "prompt" / "conf.d"
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "prompt"
 
+_T = TypeVar("_T")
 
-def deep_merge(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
-    """Deep merge two dictionaries, with override taking precedence."""
-    result = base.copy()
+# Document markers or directives at the start of a line; files containing
+# them cannot safely share a YAML stream with other files
+_DOCUMENT_MARKER = re.compile(rb"^(?:---|\.\.\.|%)", re.MULTILINE)
 
-    for key, value in override.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = deep_merge(result[key], value)
-        elif key in result and isinstance(result[key], list) and isinstance(value, list):
-            # For lists, extend rather than replace
-            result[key] = result[key] + value
-        else:
-            result[key] = value
+# File I/O for this many files or more is spread over a thread pool
+_PARALLEL_MIN_FILES = 4
+_MAX_IO_WORKERS = 8
+
+# String values up to this length are interned (names, colors, commands)
+_INTERN_MAX_LENGTH = 32
+
+
+def _parse_yaml(stream: bytes | str) -> Any:
+    """Parse YAML, preferring libyaml's CSafeLoader when PyYAML was built with it."""
+    import yaml  # Deferred so cache hits never import the parser
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(stream, Loader=loader)
+
+
+def deep_merge(
+    base: dict[str, Any], override: dict[str, Any], *, inplace: bool = False
+) -> dict[str, Any]:
+    """Deep merge two dictionaries, with override taking precedence.
+
+    Only subtrees where both sides have a key are walked, using an explicit
+    stack rather than recursion. With inplace=True, base (and any nested
+    dicts/lists it shares with the result) is updated directly instead of
+    being copied.
+    """
+    result = base if inplace else base.copy()
+    stack = [(result, override)]
+
+    while stack:
+        dst, src = stack.pop()
+        for key, value in src.items():
+            if key not in dst:
+                dst[key] = value
+                continue
+
+            existing = dst[key]
+            if isinstance(existing, dict) and isinstance(value, dict):
+                if not inplace:
+                    existing = dst[key] = existing.copy()
+                stack.append((existing, value))
+            elif isinstance(existing, list) and isinstance(value, list):
+                # For lists, extend rather than replace
+                if inplace:
+                    existing.extend(value)
+                else:
+                    dst[key] = existing + value
+            else:
+                dst[key] = value
 
     return result
 
 
+def _intern_value(value: Any) -> Any:
+    """Intern a short string value, leaving anything else unchanged."""
+    if isinstance(value, str) and len(value) <= _INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+def _intern_strings(data: dict[str, Any]) -> dict[str, Any]:
+    """Intern all string keys and short string values in place.
+
+    Parsed configs repeat a small vocabulary (category names, colors, command
+    names); interning shares one object per distinct string and makes later
+    comparisons between them identity checks.
+    """
+    stack: list[dict[Any, Any] | list[Any]] = [data]
+
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            items = list(node.items())
+            node.clear()
+            for key, value in items:
+                if isinstance(key, str):
+                    key = sys.intern(key)
+                node[key] = _intern_value(value)
+                if isinstance(value, (dict, list)):
+                    stack.append(value)
+        else:
+            for i, value in enumerate(node):
+                node[i] = _intern_value(value)
+                if isinstance(value, (dict, list)):
+                    stack.append(value)
+
+    return data
+
+
+def _cache_file_for(path: Path, st: os.stat_result) -> Path:
+    """Get the cache file for a config file in its current state.
+
+    The name is '<hash of the path>-<mtime>-<size>.pickle', so entries for
+    older states of the same file share a prefix (see _prune_cache).
+    """
+    path_key = hashlib.sha1(str(path.resolve()).encode()).hexdigest()
+    return DEFAULT_CACHE_DIR / f"{path_key}-{st.st_mtime_ns}-{st.st_size}.pickle"
+
+
+def _read_cache(cache_file: Path) -> dict[str, Any] | None:
+    """Read parsed data from the cache, returning None on a miss."""
+    try:
+        with open(cache_file, "rb") as f:
+            data = pickle.load(f)
+    except Exception:
+        # Missing, truncated or written by an incompatible version
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _write_cache(cache_file: Path, data: dict[str, Any]) -> None:
+    """Atomically write parsed data to the cache (best effort)."""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(pickle.dumps(data, protocol=5))
+            os.replace(tmp_path, cache_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        return
+    _prune_cache(cache_file)
+
+
+def _prune_cache(cache_file: Path) -> None:
+    """Remove cache entries for older states of the same config file."""
+    path_key = cache_file.name.partition("-")[0]
+    for stale in cache_file.parent.glob(f"{path_key}-*.pickle"):
+        if stale != cache_file:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+
+def _can_share_stream(data: bytes) -> bool:
+    """Check if a file's bytes parse identically inside a multi-document stream."""
+    return (
+        (not data or data.endswith(b"\n"))
+        and not data.startswith(codecs.BOM_UTF8)
+        and _DOCUMENT_MARKER.search(data) is None
+    )
+
+
+def _parse_yaml_files(paths: list[Path]) -> list[Any]:
+    """Parse YAML files, sharing a single parser run when possible.
+
+    Files that can share a stream are joined as explicit documents and parsed
+    with one load_all call. Anything else, including a stream that fails to
+    parse, falls back to parsing each file on its own.
+    """
+    if len(paths) > 1:
+        import yaml
+
+        buffers = _map_io(Path.read_bytes, paths)
+        if all(_can_share_stream(data) for data in buffers):
+            stream = b"".join(b"---\n" + data for data in buffers)
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+            try:
+                documents = list(yaml.load_all(stream, Loader=loader))
+            except yaml.YAMLError:
+                documents = []
+            if len(documents) == len(paths):
+                return documents
+
+    return [_parse_yaml_file(path) for path in paths]
+
+
+def _parse_yaml_file(path: Path) -> Any:
+    """Parse a single YAML file from one bytes read.
+
+    Handing libyaml the whole buffer lets it decode and scan in C without
+    calling back into Python for each chunk. Error marks are relabelled with
+    the file path, which a bytes stream does not carry.
+    """
+    import yaml
+
+    try:
+        return _parse_yaml(path.read_bytes())
+    except yaml.MarkedYAMLError as e:
+        if e.context_mark is not None:
+            e.context_mark = _relabel_mark(e.context_mark, str(path))
+        if e.problem_mark is not None:
+            e.problem_mark = _relabel_mark(e.problem_mark, str(path))
+        raise
+
+
+def _relabel_mark(mark: Any, name: str) -> Any:
+    """Copy a YAML error mark under a new stream name."""
+    import yaml
+
+    return yaml.Mark(name, mark.index, mark.line, mark.column, mark.buffer, mark.pointer)
+
+
+def _map_io(func: Callable[[Path], _T], paths: list[Path]) -> list[_T]:
+    """Apply an I/O-bound function to paths, in order.
+
+    With enough files the calls run on a small thread pool so their stat,
+    open and read syscalls overlap (each releases the GIL while blocked).
+    """
+    if len(paths) < _PARALLEL_MIN_FILES:
+        return [func(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=min(_MAX_IO_WORKERS, len(paths))) as executor:
+        return list(executor.map(func, paths))
+
+
+def _probe_cache(path: Path) -> tuple[Path | None, dict[str, Any] | None]:
+    """Stat a file and look it up in the cache.
+
+    Returns:
+        Tuple of (cache_file, cached_data); cache_file is None if the file
+        does not exist and cached_data is None on a cache miss
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        return None, None
+
+    cache_file = _cache_file_for(path, st)
+    return cache_file, _read_cache(cache_file)
+
+
+def _load_yaml_files(paths: list[Path]) -> list[dict[str, Any]]:
+    """Load YAML files, returning an empty dict for each missing or empty file.
+
+    Parsed files are cached under ~/.cache/prompt/ keyed by path, mtime and
+    size, so unchanged files skip YAML parsing on later runs. Cache misses are
+    parsed together (see _parse_yaml_files).
+    """
+    results: list[dict[str, Any]] = []
+    misses: list[tuple[int, Path, Path]] = []  # (result index, path, cache file)
+
+    for path, (cache_file, cached) in zip(paths, _map_io(_probe_cache, paths), strict=True):
+        if cache_file is not None and cached is None:
+            misses.append((len(results), path, cache_file))
+        results.append(cached if cached is not None else {})
+
+    parsed = _parse_yaml_files([path for _, path, _ in misses])
+    for (index, _path, cache_file), data in zip(misses, parsed, strict=True):
+        data = data if data else {}
+        results[index] = data
+        _write_cache(cache_file, data)
+
+    return results
+
+
 def load_yaml_file(path: Path) -> dict[str, Any]:
-    """Load a YAML file, returning empty dict if not found."""
-    if not path.exists():
-        return {}
-    with open(path) as f:
-        data = yaml.safe_load(f)
-        return data if data else {}
+    """Load a YAML file, returning empty dict if not found.
+
+    Parsed files are cached under ~/.cache/prompt/ keyed by path, mtime and
+    size, so unchanged files skip YAML parsing on later runs.
+    """
+    return _load_yaml_files([path])[0]
 
 
 def load_dropin_directory(dropin_dir: Path) -> dict[str, Any]:
-    """Load and merge all YAML files from drop-in directory."""
-    if not dropin_dir.exists():
+    """Load and merge all YAML files from drop-in directory.
+
+    Files ending in .yaml or .yml are merged in file name order.
+    """
+    try:
+        with os.scandir(dropin_dir) as it:
+            entries = [
+                entry for entry in it if entry.name.endswith((".yaml", ".yml")) and entry.is_file()
+            ]
+    except OSError:
         return {}
 
-    result: dict[str, Any] = {}
-    yaml_files = sorted(dropin_dir.glob("*.yaml")) + sorted(dropin_dir.glob("*.yml"))
+    entries.sort(key=lambda entry: entry.name)
 
-    for yaml_file in yaml_files:
-        data = load_yaml_file(yaml_file)
-        result = deep_merge(result, data)
+    result: dict[str, Any] = {}
+    for data in _load_yaml_files([Path(entry.path) for entry in entries]):
+        # Merged by copy, as YAML aliases may share nodes within a file
+        result = deep_merge(result, data) if result else data
 
     return result
 
@@ -82,13 +336,20 @@ def load_config(
 
     # Load and merge drop-in configs
     dropin_config = load_dropin_directory(dropin_dir)
-    merged_data = deep_merge(main_config, dropin_config)
+    if not dropin_config:
+        merged_data = main_config
+    elif not main_config:
+        merged_data = dropin_config
+    else:
+        # Not in place: YAML aliases share nodes, and writing through one
+        # would also change its anchor
+        merged_data = deep_merge(main_config, dropin_config)
 
     # Parse into Config model
-    return Config(**merged_data)
+    return Config(**_intern_strings(merged_data))
 
 
 def load_config_from_string(yaml_string: str) -> Config:
     """Load configuration from a YAML string (useful for testing)."""
-    data = yaml.safe_load(yaml_string)
-    return Config(**(data if data else {}))
+    data = _parse_yaml(yaml_string)
+    return Config(**_intern_strings(data if data else {}))
@@ -2,25 +2,31 @@
 
 from __future__ import annotations
 
-from typing import Any, Literal
+import re
+from collections.abc import Callable, Iterable
+from typing import Annotated, Any, Literal, TypeAlias
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    TypeAdapter,
+    ValidationError,
+    field_validator,
+)
 
+# A color specification string like 'bold red on white'
+Color: TypeAlias = str
 
-class Color(BaseModel):
-    """A color specification string like 'bold red on white'."""
 
-    value: str
+class FrozenModel(BaseModel):
+    """Base for schema models, which are immutable once loaded."""
 
-    @classmethod
-    def from_str(cls, value: str) -> Color:
-        return cls(value=value)
-
-    def __str__(self) -> str:
-        return self.value
+    model_config = ConfigDict(frozen=True)
 
 
-class FlagHelp(BaseModel):
+class FlagHelp(FrozenModel):
     """Help information for a flag."""
 
     flag: str = Field(description="Flag syntax, e.g., '-I directory'")
@@ -28,7 +34,7 @@ class FlagHelp(BaseModel):
     help: str = Field(default="", description="Long help text with markup")
 
 
-class ValidatorConfig(BaseModel):
+class ValidatorConfig(FrozenModel):
     """Base validator configuration."""
 
     type: str = Field(description="Validator type: file, directory, choice, etc.")
@@ -79,7 +85,13 @@ class CustomValidator(ValidatorConfig):
     command: str = Field(description="Path to external command")
 
 
-Validator = FileValidator | ChoiceValidator | MultipleChoiceValidator | WarningsValidator | CustomValidator
+Validator = Annotated[
+    FileValidator | ChoiceValidator | MultipleChoiceValidator | WarningsValidator | CustomValidator,
+    Field(discriminator="type"),
+]
+
+# Dispatches on "type" inside pydantic-core rather than in Python
+_validator_adapter: TypeAdapter[Validator] = TypeAdapter(Validator)
 
 
 def parse_validator(data: dict[str, Any] | None) -> Validator | None:
@@ -88,22 +100,30 @@ def parse_validator(data: dict[str, Any] | None) -> Validator | None:
         return None
 
     validator_type = data.get("type", "file")
-    match validator_type:
-        case "file" | "directory":
-            return FileValidator(**data)
-        case "choice":
-            return ChoiceValidator(**data)
-        case "multiple-choice":
-            return MultipleChoiceValidator(**data)
-        case "warnings":
-            return WarningsValidator(**data)
-        case "custom":
-            return CustomValidator(**data)
-        case _:
-            raise ValueError(f"Unknown validator type: {validator_type}")
-
-
-class Flag(BaseModel):
+    try:
+        return _validator_adapter.validate_python({**data, "type": validator_type})
+    except ValidationError as e:
+        if any(error["type"] == "union_tag_invalid" for error in e.errors()):
+            raise ValueError(f"Unknown validator type: {validator_type}") from None
+        raise
+
+
+def _anchor_pattern(pattern: str) -> str:
+    """Wrap a pattern in '^...$', skipping anchors it already has.
+
+    A repeated anchor is redundant ('^^a$$' matches exactly like '^a$'),
+    so this only keeps the compiled pattern smaller.
+    """
+    if not pattern.startswith("^"):
+        pattern = "^" + pattern
+    # A trailing '$' is an anchor unless escaped by an odd number of backslashes
+    body = pattern[:-1]
+    if not pattern.endswith("$") or (len(body) - len(body.rstrip("\\"))) % 2:
+        pattern += "$"
+    return pattern
+
+
+class Flag(FrozenModel):
     """Flag definition with regex patterns and category."""
 
     category: str = Field(description="Category name, e.g., 'Includes'")
@@ -116,12 +136,31 @@ class Flag(BaseModel):
     validator: dict[str, Any] | None = Field(default=None, description="Validator configuration")
     help: list[FlagHelp] = Field(default_factory=list, description="Help entries for this flag")
 
+    _compiled_regexps: tuple[re.Pattern[str], ...] | None = PrivateAttr(default=None)
+
+    @property
+    def compiled_regexps(self) -> tuple[re.Pattern[str], ...]:
+        """Regexps compiled once, anchored to match whole tokens.
+
+        Invalid patterns are skipped with a warning.
+        """
+        if self._compiled_regexps is None:
+            compiled: list[re.Pattern[str]] = []
+            for pattern_str in self.regexps:
+                try:
+                    compiled.append(re.compile(_anchor_pattern(pattern_str)))
+                except re.error as e:
+                    # Log warning but continue
+                    print(f"Warning: Invalid regex pattern '{pattern_str}': {e}")
+            self._compiled_regexps = tuple(compiled)
+        return self._compiled_regexps
+
     def get_validator(self) -> Validator | None:
         """Parse and return the validator configuration."""
         return parse_validator(self.validator)
 
 
-class Category(BaseModel):
+class Category(FrozenModel):
     """Category definition with colors for capture groups.
 
     Colors can be specified as:
@@ -150,21 +189,21 @@ class Category(BaseModel):
         return {}
 
 
-class CategoryMap(BaseModel):
+class CategoryMap(FrozenModel):
     """Hierarchical category grouping."""
 
     name: str = Field(description="Group name, e.g., 'Compiler'")
     categories: list[str] = Field(default_factory=list, description="List of category or group names")
 
 
-class ThemeCategory(BaseModel):
+class ThemeCategory(FrozenModel):
     """Theme color for a specific category."""
 
     category: str
     color: str
 
 
-class Theme(BaseModel):
+class Theme(FrozenModel):
     """Theme definition with colors for categories."""
 
     name: str = Field(description="Theme name, e.g., 'oblivion'")
@@ -174,13 +213,13 @@ class Theme(BaseModel):
     )
 
 
-class ProgramConfig(BaseModel):
+class ProgramConfig(FrozenModel):
     """Program-specific configuration."""
 
     default_validator: dict[str, Any] | None = Field(default=None)
 
 
-class Program(BaseModel):
+class Program(FrozenModel):
     """Program definition with aliases and flags."""
 
     name: str = Field(description="Program name, e.g., 'gcc'")
@@ -192,20 +231,139 @@ class Program(BaseModel):
     config: ProgramConfig | None = Field(default=None, description="Program-specific config")
 
 
-class KeyBindings(BaseModel):
+class KeyBindings(FrozenModel):
     """Key bindings for a mode."""
 
     bindings: dict[str, str] = Field(default_factory=dict)
 
 
-class GlobalConfig(BaseModel):
+class GlobalConfig(FrozenModel):
     """Global configuration options."""
 
     color: bool = Field(default=True, description="Enable/disable colors")
     default_validator: dict[str, Any] | None = Field(default=None)
 
 
-class Config(BaseModel):
+# A global inline flag group like (?i) or (?aL), which cannot be fused into
+# the middle of an alternation
+_GLOBAL_INLINE_FLAGS = re.compile(r"\(\?[aiLmsux]+\)")
+
+
+def _compile_program_lookup(
+    programs: Iterable[Program], ignore_case: bool = False
+) -> Callable[[str], Program | None]:
+    """Build a function mapping an executable basename to its program.
+
+    Programs are tried in config order: name (case-insensitive), then each
+    alias - literal (case-insensitive), 'glob:' (fnmatch) or 'regexp:'
+    (re.match). Names and literal aliases resolve with a single dict lookup.
+    Pattern aliases are joined into one alternation with a group per program,
+    and the group that matched identifies the program; a literal hit only has
+    to beat patterns from earlier in the config. Aliases that cannot be fused
+    (capture groups, global inline flags) split the alternation and are tried
+    on their own, in order, as is every alias of a run that fails to compile
+    once joined. Invalid regexp aliases are skipped.
+
+    Args:
+        programs: Programs in match order
+        ignore_case: Also match glob and regexp aliases case-insensitively
+    """
+    flags = re.IGNORECASE if ignore_case else 0
+    # Lowercased name -> (position, program), position being the match order
+    by_name: dict[str, tuple[int, Program]] = {}
+    # (branch, owner, fusable, position) for pattern aliases, in match order
+    branches: list[tuple[str, Program, bool, int]] = []
+    position = 0
+
+    for program in programs:
+        names = [program.name]
+        for alias in program.aliases:
+            if alias.startswith("glob:"):
+                import fnmatch  # Deferred to the first config with glob aliases
+
+                branch = fnmatch.translate(alias[5:])
+                # Python 3.10 translates '*' with named groups
+                fusable = re.compile(branch, flags).groups == 0
+                branches.append((branch, program, fusable, position))
+            elif alias.startswith("regexp:"):
+                branch = alias[7:]
+                try:
+                    compiled = re.compile(branch, flags)
+                except re.error:
+                    continue
+                # Groups would renumber (breaking backreferences) once fused,
+                # and global inline flags are only valid at the start of a pattern
+                fusable = compiled.groups == 0 and _GLOBAL_INLINE_FLAGS.search(branch) is None
+                branches.append((branch, program, fusable, position))
+            else:
+                names.append(alias)
+                continue
+            position += 1
+
+        for name in names:
+            by_name.setdefault(name.lower(), (position, program))
+            position += 1
+
+    if not branches:
+        def lookup_name(exe_name: str) -> Program | None:
+            entry = by_name.get(exe_name.lower())
+            return entry[1] if entry else None
+
+        return lookup_name
+
+    # Consecutive fusable branches share one pattern with a group per program;
+    # each segment is (first position, pattern, owners, positions) per group
+    segments: list[tuple[int, re.Pattern[str], list[Program], list[int]]] = []
+    # (owner, its (branch, position) alternatives) per group of the pending run
+    run: list[tuple[Program, list[tuple[str, int]]]] = []
+
+    def flush_run() -> None:
+        if not run:
+            return
+        try:
+            pattern = re.compile(
+                "|".join("(" + "|".join(b for b, _ in alts) + ")" for _, alts in run), flags
+            )
+        except re.error:
+            # Fall back to one pattern per alias, which each compiled on their own
+            for owner, alts in run:
+                for branch, pos in alts:
+                    segments.append((pos, re.compile(branch, flags), [owner], [pos]))
+        else:
+            segments.append(
+                (run[0][1][0][1], pattern, [owner for owner, _ in run], [alts[0][1] for _, alts in run])
+            )
+        run.clear()
+
+    for branch, owner, fusable, pos in branches:
+        if fusable and run and run[-1][0] is owner:
+            # Same program: share its group as one more alternative
+            run[-1][1].append((branch, pos))
+        elif fusable:
+            run.append((owner, [(branch, pos)]))
+        else:
+            flush_run()
+            segments.append((pos, re.compile(branch, flags), [owner], [pos]))
+    flush_run()
+
+    def lookup(exe_name: str) -> Program | None:
+        named = by_name.get(exe_name.lower())
+        limit = named[0] if named else position
+        for first, pattern, owners, positions in segments:
+            if first > limit:
+                break
+            match = pattern.match(exe_name)
+            if match:
+                index = match.lastindex - 1 if len(owners) > 1 and match.lastindex else 0
+                if positions[index] < limit:
+                    return owners[index]
+                break
+        return named[1] if named else None
+
+    return lookup
+
+
+class Config(FrozenModel):
     """Top-level configuration."""
 
     config: GlobalConfig = Field(default_factory=GlobalConfig)
@@ -221,83 +379,91 @@ class Config(BaseModel):
         default_factory=dict, description="Command aliases"
     )
 
+    # Built program lookups, keyed by ignore_case
+    _program_lookups: dict[bool, Callable[[str], Program | None]] = PrivateAttr(default_factory=dict)
+    # Program name ("" for none) to its global + program-specific flags
+    _flags_cache: dict[str, tuple[Flag, ...]] = PrivateAttr(default_factory=dict)
+    # Built by core.programs: detected (canonical_name, source) by basename,
+    # launchers by lowercased name and alias, and sorted completion names
+    _detections: dict[str, tuple[str, str]] = PrivateAttr(default_factory=dict)
+    _launchers: dict[str, tuple[str, frozenset[str]]] | None = PrivateAttr(default=None)
+    _program_names: tuple[str, ...] | None = PrivateAttr(default=None)
+    # Built by core.matcher: expand_category_map results by (category, level)
+    _category_expansions: dict[tuple[str, int | None], tuple[str, ...]] = PrivateAttr(
+        default_factory=dict
+    )
+
+    # The parsers below return plain dicts so pydantic-core builds the nested
+    # models itself in the same validation pass
+
     @field_validator("categories", mode="before")
     @classmethod
-    def parse_categories(cls, v: dict[str, Any]) -> dict[str, Category]:
+    def parse_categories(cls, v: dict[str, Any]) -> dict[str, dict[str, Any]]:
         """Parse category definitions."""
-        result = {}
-        for name, data in v.items():
-            if isinstance(data, dict):
-                result[name.lower()] = Category(name=name, **data)
-            else:
-                result[name.lower()] = Category(name=name, colors=[data] if isinstance(data, str) else data)
-        return result
+        return {
+            name.lower(): (
+                {**data, "name": name}
+                if isinstance(data, dict)
+                else {"name": name, "colors": [data] if isinstance(data, str) else data}
+            )
+            for name, data in v.items()
+        }
 
     @field_validator("category_maps", mode="before")
     @classmethod
-    def parse_category_maps(cls, v: dict[str, Any]) -> dict[str, CategoryMap]:
+    def parse_category_maps(cls, v: dict[str, Any]) -> dict[str, dict[str, Any]]:
         """Parse category map definitions."""
-        result = {}
-        for name, data in v.items():
-            if isinstance(data, list):
-                result[name.lower()] = CategoryMap(name=name, categories=data)
-            elif isinstance(data, dict):
-                result[name.lower()] = CategoryMap(name=name, **data)
-        return result
+        return {
+            name.lower(): (
+                {"name": name, "categories": data} if isinstance(data, list) else {**data, "name": name}
+            )
+            for name, data in v.items()
+            if isinstance(data, (list, dict))
+        }
 
     @field_validator("themes", mode="before")
     @classmethod
-    def parse_themes(cls, v: dict[str, Any]) -> dict[str, Theme]:
+    def parse_themes(cls, v: dict[str, Any]) -> dict[str, dict[str, Any]]:
         """Parse theme definitions."""
-        result = {}
-        for name, data in v.items():
-            if isinstance(data, dict):
-                result[name.lower()] = Theme(name=name, **data)
-        return result
+        return {name.lower(): {**data, "name": name} for name, data in v.items() if isinstance(data, dict)}
 
     @field_validator("programs", mode="before")
     @classmethod
-    def parse_programs(cls, v: dict[str, Any]) -> dict[str, Program]:
+    def parse_programs(cls, v: dict[str, Any]) -> dict[str, dict[str, Any]]:
         """Parse program definitions."""
-        result = {}
-        for name, data in v.items():
-            if isinstance(data, dict):
-                result[name.lower()] = Program(name=name, **data)
-        return result
-
-    def get_program(self, executable: str) -> Program | None:
-        """Find program config matching the executable name."""
-        import fnmatch
-        import re
-
-        exe_name = executable.split("/")[-1]  # Get basename
-
-        for program in self.programs.values():
-            # Check exact name match
-            if program.name.lower() == exe_name.lower():
-                return program
-
-            # Check aliases
-            for alias in program.aliases:
-                if alias.startswith("glob:"):
-                    pattern = alias[5:]
-                    if fnmatch.fnmatch(exe_name, pattern):
-                        return program
-                elif alias.startswith("regexp:"):
-                    pattern = alias[7:]
-                    if re.match(pattern, exe_name):
-                        return program
-                elif alias.lower() == exe_name.lower():
-                    return program
-
-        return None
-
-    def get_flags_for_program(self, executable: str) -> list[Flag]:
-        """Get all flags for a program (global + program-specific)."""
-        flags = list(self.flags)  # Start with global flags
+        return {name.lower(): {**data, "name": name} for name, data in v.items() if isinstance(data, dict)}
+
+    def get_program(self, executable: str, *, ignore_case: bool = False) -> Program | None:
+        """Find program config matching the executable name.
+
+        Args:
+            executable: Executable path or name
+            ignore_case: Also match glob and regexp aliases case-insensitively
+                (names and literal aliases always are)
+
+        Returns:
+            The first matching program, or None
+        """
+        lookup = self._program_lookups.get(ignore_case)
+        if lookup is None:
+            lookup = self._program_lookups[ignore_case] = _compile_program_lookup(
+                self.programs.values(), ignore_case
+            )
+        return lookup(executable.rpartition("/")[2])  # Match on basename
+
+    def get_flags_for_program(self, executable: str) -> tuple[Flag, ...]:
+        """Get all flags for a program (global + program-specific).
+
+        The result is built once per matched program and shared between calls.
+        """
         program = self.get_program(executable)
-        if program:
-            flags.extend(program.flags)
+        key = program.name if program else ""
+        flags = self._flags_cache.get(key)
+        if flags is None:
+            flags = tuple(self.flags)  # Start with global flags
+            if program:
+                flags += tuple(program.flags)
+            self._flags_cache[key] = flags
         return flags
 
     def get_theme(self, name: str | None = None) -> Theme:
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
 
 # Standard ANSI color names
 COLORS = {
@@ -44,8 +46,56 @@ ATTRIBUTES = {
     "strikethrough": 9,
 }
 
+# Membership sets for ColorParser: attribute words, and any single-word color
+_ATTRIBUTE_NAMES = frozenset(ATTRIBUTES)
+_COLOR_NAMES = frozenset(COLORS)
+_ANY_COLOR_NAMES = _COLOR_NAMES | frozenset(BRIGHT_COLORS)
+
+# ParsedColor attribute fields, one bit each in this order, and their SGR codes
+_ATTRIBUTE_FIELDS = ("bold", "dim", "italic", "underline", "blink", "reverse", "hidden", "strikethrough")
+_ATTRIBUTE_SGR = ("1", "2", "3", "4", "5", "7", "8", "9")
+
+# String forms of SGR code numbers
+_INT_STR = tuple(str(i) for i in range(256))
+
+# SGR codes for every combination of attribute bits
+_ATTRIBUTE_CODES: tuple[tuple[str, ...], ...] = tuple(
+    tuple(code for i, code in enumerate(_ATTRIBUTE_SGR) if bits >> i & 1)
+    for bits in range(1 << len(_ATTRIBUTE_SGR))
+)
+
+# prompt_toolkit names for colors 0-15
+_ANSI_COLOR_NAMES = (
+    "ansiblack", "ansired", "ansigreen", "ansiyellow",
+    "ansiblue", "ansimagenta", "ansicyan", "ansiwhite",
+    "ansibrightblack", "ansibrightred", "ansibrightgreen", "ansibrightyellow",
+    "ansibrightblue", "ansibrightmagenta", "ansibrightcyan", "ansibrightwhite",
+)
+
+# Color names (lowercase, spaces removed) to prompt_toolkit names
+_PROMPT_TOOLKIT_COLORS = {
+    "black": "ansiblack",
+    "red": "ansired",
+    "green": "ansigreen",
+    "yellow": "ansiyellow",
+    "blue": "ansiblue",
+    "magenta": "ansimagenta",
+    "cyan": "ansicyan",
+    "white": "ansiwhite",
+    "brightblack": "ansibrightblack",
+    "brightred": "ansibrightred",
+    "brightgreen": "ansibrightgreen",
+    "brightyellow": "ansibrightyellow",
+    "brightblue": "ansibrightblue",
+    "brightmagenta": "ansibrightmagenta",
+    "brightcyan": "ansibrightcyan",
+    "brightwhite": "ansibrightwhite",
+    "gray": "ansibrightblack",
+    "grey": "ansibrightblack",
+}
+
 
-@dataclass
+@dataclass(frozen=True)
 class ParsedColor:
     """Parsed color specification.
 
@@ -75,85 +125,50 @@ class ParsedColor:
     strikethrough: bool | None = None
     combine: bool = False
 
+    # Set attributes as a bitmap (see _ATTRIBUTE_FIELDS), and cached conversions
+    _attr_bits: int = field(init=False, repr=False, compare=False)
+    _ansi: str | None = field(default=None, init=False, repr=False, compare=False)
+    _style: str | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        bits = 0
+        for i, name in enumerate(_ATTRIBUTE_FIELDS):
+            if getattr(self, name):
+                bits |= 1 << i
+        object.__setattr__(self, "_attr_bits", bits)
+
     def to_ansi(self) -> str:
         """Convert to ANSI escape sequence."""
-        codes: list[int] = []
+        if self._ansi is not None:
+            return self._ansi
 
         # Reset first if not combining
-        if not self.combine:
-            codes.append(0)
+        codes = [] if self.combine else ["0"]
 
         # Attributes
-        if self.bold:
-            codes.append(1)
-        if self.dim:
-            codes.append(2)
-        if self.italic:
-            codes.append(3)
-        if self.underline:
-            codes.append(4)
-        if self.blink:
-            codes.append(5)
-        if self.reverse:
-            codes.append(7)
-        if self.hidden:
-            codes.append(8)
-        if self.strikethrough:
-            codes.append(9)
+        codes.extend(_ATTRIBUTE_CODES[self._attr_bits])
 
         # Foreground color
         if self.fg is not None:
-            fg_code = self._color_to_code(self.fg, foreground=True)
+            fg_code = _color_to_code(self.fg, foreground=True)
             if fg_code is not None:
-                codes.append(fg_code)
+                codes.append(_INT_STR[fg_code])
 
         # Background color
         if self.bg is not None:
-            bg_code = self._color_to_code(self.bg, foreground=False)
+            bg_code = _color_to_code(self.bg, foreground=False)
             if bg_code is not None:
-                codes.append(bg_code)
-
-        if not codes:
-            return ""
-
-        return f"\033[{';'.join(str(c) for c in codes)}m"
-
-    def _color_to_code(self, color: str | int, foreground: bool) -> int | None:
-        """Convert color to ANSI code."""
-        base = 30 if foreground else 40
-
-        if isinstance(color, int):
-            if 0 <= color <= 7:
-                return base + color
-            elif 8 <= color <= 15:
-                return (90 if foreground else 100) + (color - 8)
-            else:
-                # 256 color - need different format
-                return None  # TODO: implement 256 color support
-
-        color_lower = color.lower()
-
-        if color_lower in COLORS:
-            return base + COLORS[color_lower]
-
-        if color_lower in BRIGHT_COLORS:
-            bright_base = 90 if foreground else 100
-            color_num = BRIGHT_COLORS[color_lower]
-            if color_num >= 8:
-                return bright_base + (color_num - 8)
-            return base + color_num
-
-        # Check for "bright <color>" format
-        if color_lower.startswith("bright "):
-            base_color = color_lower[7:]
-            if base_color in COLORS:
-                bright_base = 90 if foreground else 100
-                return bright_base + COLORS[base_color]
+                codes.append(_INT_STR[bg_code])
 
-        return None
+        ansi = f"\033[{';'.join(codes)}m" if codes else ""
+        object.__setattr__(self, "_ansi", ansi)
+        return ansi
 
     def to_prompt_toolkit_style(self) -> str:
         """Convert to prompt_toolkit style string."""
+        if self._style is not None:
+            return self._style
+
         parts: list[str] = []
 
         if self.bold:
@@ -174,56 +189,66 @@ class ParsedColor:
             parts.append("strike")
 
         if self.fg is not None:
-            fg_name = self._normalize_color_name(self.fg)
+            fg_name = _normalize_color_name(self.fg)
             if fg_name:
                 parts.append(fg_name)
 
         if self.bg is not None:
-            bg_name = self._normalize_color_name(self.bg)
+            bg_name = _normalize_color_name(self.bg)
             if bg_name:
                 parts.append(f"bg:{bg_name}")
 
-        return " ".join(parts)
-
-    def _normalize_color_name(self, color: str | int) -> str:
-        """Normalize color to prompt_toolkit format."""
-        if isinstance(color, int):
-            if 0 <= color <= 15:
-                # Map to ansi color names
-                names = [
-                    "ansiblack", "ansired", "ansigreen", "ansiyellow",
-                    "ansiblue", "ansimagenta", "ansicyan", "ansiwhite",
-                    "ansibrightblack", "ansibrightred", "ansibrightgreen", "ansibrightyellow",
-                    "ansibrightblue", "ansibrightmagenta", "ansibrightcyan", "ansibrightwhite",
-                ]
-                return names[color]
-            return f"#{color:02x}{color:02x}{color:02x}"
-
-        color_lower = color.lower().replace(" ", "")
-
-        # Map to prompt_toolkit names
-        color_map = {
-            "black": "ansiblack",
-            "red": "ansired",
-            "green": "ansigreen",
-            "yellow": "ansiyellow",
-            "blue": "ansiblue",
-            "magenta": "ansimagenta",
-            "cyan": "ansicyan",
-            "white": "ansiwhite",
-            "brightblack": "ansibrightblack",
-            "brightred": "ansibrightred",
-            "brightgreen": "ansibrightgreen",
-            "brightyellow": "ansibrightyellow",
-            "brightblue": "ansibrightblue",
-            "brightmagenta": "ansibrightmagenta",
-            "brightcyan": "ansibrightcyan",
-            "brightwhite": "ansibrightwhite",
-            "gray": "ansibrightblack",
-            "grey": "ansibrightblack",
-        }
-
-        return color_map.get(color_lower, color_lower)
+        style = " ".join(parts)
+        object.__setattr__(self, "_style", style)
+        return style
+
+
+@lru_cache(maxsize=512)
+def _color_to_code(color: str | int, foreground: bool) -> int | None:
+    """Convert color to ANSI code."""
+    base = 30 if foreground else 40
+
+    if isinstance(color, int):
+        if 0 <= color <= 7:
+            return base + color
+        elif 8 <= color <= 15:
+            return (90 if foreground else 100) + (color - 8)
+        else:
+            # 256 color - need different format
+            return None  # TODO: implement 256 color support
+
+    color_lower = color.lower()
+
+    if color_lower in COLORS:
+        return base + COLORS[color_lower]
+
+    if color_lower in BRIGHT_COLORS:
+        bright_base = 90 if foreground else 100
+        color_num = BRIGHT_COLORS[color_lower]
+        if color_num >= 8:
+            return bright_base + (color_num - 8)
+        return base + color_num
+
+    # Check for "bright <color>" format
+    if color_lower.startswith("bright "):
+        base_color = color_lower[7:]
+        if base_color in COLORS:
+            bright_base = 90 if foreground else 100
+            return bright_base + COLORS[base_color]
+
+    return None
+
+
+@lru_cache(maxsize=512)
+def _normalize_color_name(color: str | int) -> str:
+    """Normalize color to prompt_toolkit format."""
+    if isinstance(color, int):
+        if 0 <= color <= 15:
+            return _ANSI_COLOR_NAMES[color]
+        return f"#{color:02x}{color:02x}{color:02x}"
+
+    color_lower = color.lower().replace(" ", "")
+    return _PROMPT_TOOLKIT_COLORS.get(color_lower, color_lower)
 
 
 class ColorParser:
@@ -248,59 +273,71 @@ class ColorParser:
             >>> color.bold
             True
         """
-        if not color_spec:
-            return ParsedColor()
+        return _parse_color_spec(color_spec)
 
-        # Check for combine prefix
-        combine = color_spec.startswith("+")
-        if combine:
-            color_spec = color_spec[1:].strip()
 
-        result = ParsedColor(combine=combine)
-        parts = color_spec.lower().split()
+@lru_cache(maxsize=1024)
+def _parse_color_spec(color_spec: str) -> ParsedColor:
+    """Parse a color specification string (see ColorParser.parse).
 
-        i = 0
-        while i < len(parts):
-            part = parts[i]
-
-            # Check for attributes
-            if part in ATTRIBUTES:
-                setattr(result, part if part != "inverse" else "reverse", True)
-                i += 1
-                continue
+    Results are cached, since specs repeat across tokens and ParsedColor is
+    immutable.
+    """
+    if not color_spec:
+        return ParsedColor()
+
+    # Check for combine prefix
+    combine = color_spec.startswith("+")
+    if combine:
+        color_spec = color_spec[1:].strip()
+
+    fg: str | None = None
+    bg: str | None = None
+    attributes: dict[str, Any] = {}
+    parts = color_spec.lower().split()
+
+    i = 0
+    while i < len(parts):
+        part = parts[i]
+
+        # Check for attributes
+        if part in _ATTRIBUTE_NAMES:
+            attributes[part if part != "inverse" else "reverse"] = True
+            i += 1
+            continue
 
-            # Check for "on" keyword (background)
-            if part == "on" and i + 1 < len(parts):
-                # Next part(s) are background color
-                bg_parts: list[str] = []
+        # Check for "on" keyword (background)
+        if part == "on" and i + 1 < len(parts):
+            # Next part(s) are background color
+            bg_parts: list[str] = []
+            i += 1
+            while i < len(parts) and parts[i] not in _ATTRIBUTE_NAMES and parts[i] != "on":
+                bg_parts.append(parts[i])
                 i += 1
-                while i < len(parts) and parts[i] not in ATTRIBUTES and parts[i] != "on":
-                    bg_parts.append(parts[i])
-                    i += 1
-                result.bg = " ".join(bg_parts)
+            bg = " ".join(bg_parts)
+            continue
+
+        # Check for "bright" prefix
+        if part == "bright" and i + 1 < len(parts):
+            next_part = parts[i + 1]
+            if next_part in _COLOR_NAMES:
+                if fg is None:
+                    fg = f"bright {next_part}"
+                i += 2
                 continue
 
-            # Check for "bright" prefix
-            if part == "bright" and i + 1 < len(parts):
-                next_part = parts[i + 1]
-                if next_part in COLORS or next_part in ("black", "white"):
-                    if result.fg is None:
-                        result.fg = f"bright {next_part}"
-                    i += 2
-                    continue
-
-            # Must be a color name (foreground)
-            if part in COLORS or part in BRIGHT_COLORS:
-                if result.fg is None:
-                    result.fg = part
-            elif part.startswith("#") or part.isdigit():
-                # Hex or numeric color
-                if result.fg is None:
-                    result.fg = part
+        # Must be a color name (foreground)
+        if part in _ANY_COLOR_NAMES:
+            if fg is None:
+                fg = part
+        elif part.startswith("#") or part.isdigit():
+            # Hex or numeric color
+            if fg is None:
+                fg = part
 
-            i += 1
+        i += 1
 
-        return result
+    return ParsedColor(fg=fg, bg=bg, combine=combine, **attributes)
 
 
 def parse_color(color_spec: str) -> ParsedColor:
@@ -312,7 +349,7 @@ def parse_color(color_spec: str) -> ParsedColor:
     Returns:
         ParsedColor object
     """
-    return ColorParser().parse(color_spec)
+    return _parse_color_spec(color_spec)
 
 
 def combine_colors(base: ParsedColor, overlay: ParsedColor) -> ParsedColor:
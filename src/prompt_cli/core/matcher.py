@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+import sys
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, TypeAlias
 
 from prompt_cli.core.programs import ProgramMatch, detect_program, find_compiler
 
@@ -12,12 +14,29 @@ if TYPE_CHECKING:
     from prompt_cli.config.schema import Config, Flag
     from prompt_cli.core.tokenizer import Token
 
+    # A fused (or single) pattern and the pattern/flag behind each branch
+    _Segment: TypeAlias = tuple[re.Pattern[str], dict[int, tuple[re.Pattern[str], Flag]]]
 
-@dataclass
+# Flags of a pattern compiled without inline flags like (?i)
+_DEFAULT_RE_FLAGS = re.compile("").flags
+
+# Backreferences (\1, \g<1>, (?P=name), (?(1)...)) would point at the wrong
+# group once a pattern is fused into an alternation
+_BACKREFERENCE = re.compile(r"\\[1-9]|\\g<|\(\?P=|\(\?\(")
+
+# A flag pattern ('^...$') whose body matches only itself
+_LITERAL_PATTERN = re.compile(r"\^[^.^$*+?{}\[\]\\|()]*\$")
+
+# Distinct token values remembered by Matcher.match_token
+_MATCH_CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True, slots=True)
 class CaptureGroup:
     """A captured group from a regex match.
 
-    Supports both numeric and named capture groups.
+    Supports both numeric and named capture groups. Immutable, since match
+    results for repeated token values share their groups.
     """
 
     value: str
@@ -27,14 +46,14 @@ class CaptureGroup:
     name: str | None = None  # Named group name (e.g., "flag", "value")
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchResult:
     """Result of matching a token against flag patterns."""
 
     token: Token
     category: str
     flag: Flag | None = None
-    groups: list[CaptureGroup] = field(default_factory=list)
+    groups: tuple[CaptureGroup, ...] = ()  # Shared by results for the same token value
     matched: bool = False
 
     @property
@@ -92,12 +111,23 @@ class Matcher:
         self.program_match: ProgramMatch | None = None
         if executable:
             self.program_match = detect_program(executable, config)
+        # What match_tokens falls back to when it finds no known compiler
+        self._default_program_match = self.program_match
 
         self._compiled_patterns: dict[str, list[tuple[re.Pattern[str], Flag]]] = {}
+        self._segments: list[_Segment] = []
+        # Literal token value to flag, when every pattern is a plain string
+        self._literal_flags: dict[str, Flag] | None = None
+        # Token value to (category, flag, groups); group positions are token-relative
+        self._match_cache: dict[str, tuple[str, Flag | None, tuple[CaptureGroup, ...]]] = {}
+        # (results, their length, by-category index, flagged index) last indexed
+        self._category_index: (
+            tuple[list[MatchResult], int, dict[str, list[int]], dict[str, list[int]]] | None
+        ) = None
         self._compile_patterns()
 
     def _compile_patterns(self) -> None:
-        """Compile regex patterns from flags."""
+        """Collect compiled regex patterns from flags, grouped by category."""
         # Use canonical program name if detected
         program_name = ""
         if self.program_match:
@@ -105,17 +135,17 @@ class Matcher:
         flags = self.config.get_flags_for_program(program_name)
 
         for flag in flags:
-            category = flag.category.lower()
+            category = sys.intern(flag.category.lower())
             if category not in self._compiled_patterns:
                 self._compiled_patterns[category] = []
 
-            for pattern_str in flag.regexps:
-                try:
-                    pattern = re.compile(f"^{pattern_str}$")
-                    self._compiled_patterns[category].append((pattern, flag))
-                except re.error as e:
-                    # Log warning but continue
-                    print(f"Warning: Invalid regex pattern '{pattern_str}': {e}")
+            for pattern in flag.compiled_regexps:
+                self._compiled_patterns[category].append((pattern, flag))
+
+        entries = [entry for patterns in self._compiled_patterns.values() for entry in patterns]
+        self._segments = _fuse_patterns(entries)
+        self._literal_flags = _literal_flags(entries)
+        self._match_cache = {}
 
     def match_token(self, token: Token) -> MatchResult:
         """Match a single token against all patterns.
@@ -126,35 +156,63 @@ class Matcher:
         Returns:
             MatchResult with category and captured groups
         """
-        for _category, patterns in self._compiled_patterns.items():
-            for pattern, flag in patterns:
-                match = pattern.match(token.value)
-                if match:
-                    groups = self._extract_groups(match, token, flag)
-                    return MatchResult(
-                        token=token,
-                        category=flag.category,  # Use original case from flag
-                        flag=flag,
-                        groups=groups,
-                        matched=True,
-                    )
-
-        # No match - use default category
+        value = token.value
+        cached = self._match_cache.get(value)
+        if cached is None:
+            cached = self._match_value(token)
+            if len(self._match_cache) >= _MATCH_CACHE_SIZE:
+                del self._match_cache[next(iter(self._match_cache))]
+            self._match_cache[value] = cached
+
+        category, flag, groups = cached
         return MatchResult(
             token=token,
-            category="Default",
-            flag=None,
-            groups=[
-                CaptureGroup(
-                    value=token.value,
-                    start=0,
-                    end=len(token.value),
-                    group_index=0,
-                )
-            ],
-            matched=False,
+            category=category,
+            flag=flag,
+            groups=groups,
+            matched=flag is not None,
         )
 
+    def _match_value(self, token: Token) -> tuple[str, Flag | None, tuple[CaptureGroup, ...]]:
+        """Find the first flag pattern matching a token's value.
+
+        Args:
+            token: The token to match
+
+        Returns:
+            Tuple of (category, flag, capture groups); flag is None and the
+            category "Default" if nothing matched
+        """
+        value = token.value
+        if self._literal_flags is not None:
+            return _match_literal(self._literal_flags, value)
+
+        for segment, owners in self._segments:
+            match = segment.match(value)
+            if match is None:
+                continue
+
+            if len(owners) == 1:
+                [(_pattern, flag)] = owners.values()
+                groups = self._extract_groups(match, token, flag)
+            else:
+                pattern, flag = owners[match.lastindex or 0]
+                if pattern.groups:
+                    # Rerun the branch that matched for its own group numbering
+                    match = pattern.match(value)
+                    if match is None:
+                        continue
+                    groups = self._extract_groups(match, token, flag)
+                else:
+                    groups = [CaptureGroup(value=value, start=0, end=len(value), group_index=0)]
+
+            # Original case from flag, interned so category comparisons are
+            # identity checks for any config source
+            return sys.intern(flag.category), flag, tuple(groups)
+
+        # No match - use default category
+        return "Default", None, (CaptureGroup(value=value, start=0, end=len(value), group_index=0),)
+
     def _extract_groups(
         self, match: re.Match[str], token: Token, flag: Flag | None = None
     ) -> list[CaptureGroup]:
@@ -174,43 +232,21 @@ class Matcher:
         Returns:
             List of CaptureGroup objects with names assigned
         """
-        groups: list[CaptureGroup] = []
-
-        # Get named groups from regexp: name -> group_index
-        regexp_named_groups = match.re.groupindex  # dict of name -> group_number
-
-        # Invert to get group_number -> name
-        index_to_name: dict[int, str] = {v: k for k, v in regexp_named_groups.items()}
-
-        # Get capture_groups from flag config if available
-        flag_group_names: list[str] = []
+        # Name for each group number - 1: regexp named > flag capture_groups > None
+        names: list[str | None] = [None] * match.re.groups
         if flag and flag.capture_groups:
-            flag_group_names = flag.capture_groups
-
-        # Extract all capture groups
-        for i, group_value in enumerate(match.groups(), start=1):
-            if group_value is not None:
-                start = match.start(i)
-                end = match.end(i)
-
-                # Determine name: regexp named > flag capture_groups > None
-                name: str | None = None
-                if i in index_to_name:
-                    # Named group in regexp
-                    name = index_to_name[i]
-                elif flag_group_names and i - 1 < len(flag_group_names):
-                    # Name from flag capture_groups (0-indexed for the list)
-                    name = flag_group_names[i - 1]
-
-                groups.append(
-                    CaptureGroup(
-                        value=group_value,
-                        start=start,
-                        end=end,
-                        group_index=i,
-                        name=name,
-                    )
-                )
+            # capture_groups is 0-indexed; extra names are ignored
+            count = min(len(flag.capture_groups), len(names))
+            names[:count] = flag.capture_groups[:count]
+        for name, index in match.re.groupindex.items():
+            names[index - 1] = name
+
+        # Extract all capture groups that took part in the match
+        groups = [
+            CaptureGroup(group_value, *match.span(i), i, names[i - 1])
+            for i, group_value in enumerate(match.groups(), start=1)
+            if group_value is not None
+        ]
 
         # If no capture groups, treat the whole match as group 0
         if not groups:
@@ -249,76 +285,43 @@ class Matcher:
         # Find the actual compiler (handles launchers)
         compiler_match = find_compiler(tokens, self.config)
 
-        # Update our program_match if find_compiler found something different
+        # Use the compiler find_compiler detected, or go back to the program
+        # from the executable so a previous line's compiler does not stick
+        previous = self.program_match.canonical_name if self.program_match else ""
         if compiler_match and compiler_match.source != "unknown":
             self.program_match = compiler_match
-            # Recompile patterns for the detected program
+        else:
+            self.program_match = self._default_program_match
+        current = self.program_match.canonical_name if self.program_match else ""
+        # Recompile patterns (dropping cached matches) if the program changed
+        if current != previous:
             self._compiled_patterns.clear()
             self._compile_patterns()
 
-        # Determine special token indices
-        compiler_index = compiler_match.token_index if compiler_match else 0
-        launcher_end = 0
+        # Categories for special token indices; launcher > launcher args > compiler
+        special: dict[int, str] = {compiler_match.token_index if compiler_match else 0: "Executable"}
         if compiler_match and compiler_match.launcher:
-            launcher_end = compiler_match.launcher.args_end_index
+            launcher = compiler_match.launcher
+            for i in range(launcher.token_index + 1, launcher.args_end_index):
+                special[i] = "LauncherArg"
+            special[launcher.token_index] = "Launcher"
 
+        match_token = self.match_token
         for i, token in enumerate(tokens):
-            if compiler_match and compiler_match.launcher and i == compiler_match.launcher.token_index:
-                # This is the launcher
-                results.append(
-                    MatchResult(
-                        token=token,
-                        category="Launcher",
-                        flag=None,
-                        groups=[
-                            CaptureGroup(
-                                value=token.value,
-                                start=0,
-                                end=len(token.value),
-                                group_index=0,
-                            )
-                        ],
-                        matched=True,
-                    )
-                )
-            elif compiler_match and compiler_match.launcher and i > compiler_match.launcher.token_index and i < launcher_end:
-                # This is a launcher argument
-                results.append(
-                    MatchResult(
-                        token=token,
-                        category="LauncherArg",
-                        flag=None,
-                        groups=[
-                            CaptureGroup(
-                                value=token.value,
-                                start=0,
-                                end=len(token.value),
-                                group_index=0,
-                            )
-                        ],
-                        matched=True,
-                    )
-                )
-            elif i == compiler_index:
-                # This is the actual compiler/executable
+            category = special.get(i)
+            if category is None:
+                results.append(match_token(token))
+            else:
+                value = token.value
                 results.append(
                     MatchResult(
                         token=token,
-                        category="Executable",
+                        category=category,
                         flag=None,
-                        groups=[
-                            CaptureGroup(
-                                value=token.value,
-                                start=0,
-                                end=len(token.value),
-                                group_index=0,
-                            )
-                        ],
+                        groups=(CaptureGroup(value=value, start=0, end=len(value), group_index=0),),
                         matched=True,
                     )
                 )
-            else:
-                results.append(self.match_token(token))
 
         return results
 
@@ -326,26 +329,49 @@ class Matcher:
         """Get just the category name for a token."""
         return self.match_token(token).category
 
-    def find_duplicates(self, results: list[MatchResult]) -> dict[str, list[int]]:
-        """Find duplicate flags in match results.
+    def _index_categories(
+        self, results: list[MatchResult]
+    ) -> tuple[dict[str, list[int]], dict[str, list[int]]]:
+        """Index result positions by category in a single pass.
+
+        The index for the most recent results list is kept, so repeated
+        duplicate/equivalence queries on the same results do not rescan it.
 
         Args:
             results: List of match results
 
         Returns:
-            Dict mapping category to list of indices with duplicates
+            Tuple of (all indices, indices of results matched by a flag),
+            each keyed by category
         """
-        category_indices: dict[str, list[int]] = {}
+        indexed = self._category_index
+        if indexed is not None and indexed[0] is results and indexed[1] == len(results):
+            return indexed[2], indexed[3]
 
+        by_category: dict[str, list[int]] = {}
+        flagged: dict[str, list[int]] = {}
         for i, result in enumerate(results):
+            category = result.category
+            by_category.setdefault(category, []).append(i)
             if result.matched and result.flag:
-                category = result.category
-                if category not in category_indices:
-                    category_indices[category] = []
-                category_indices[category].append(i)
+                flagged.setdefault(category, []).append(i)
+
+        self._category_index = (results, len(results), by_category, flagged)
+        return by_category, flagged
+
+    def find_duplicates(self, results: list[MatchResult]) -> dict[str, list[int]]:
+        """Find duplicate flags in match results.
+
+        Args:
+            results: List of match results
+
+        Returns:
+            Dict mapping category to list of indices with duplicates
+        """
+        _by_category, flagged = self._index_categories(results)
 
         # Filter to only categories with duplicates
-        return {cat: indices for cat, indices in category_indices.items() if len(indices) > 1}
+        return {cat: list(indices) for cat, indices in flagged.items() if len(indices) > 1}
 
     def get_equivalent_indices(
         self, results: list[MatchResult], current_index: int
@@ -362,12 +388,98 @@ class Matcher:
         if current_index < 0 or current_index >= len(results):
             return []
 
-        current_category = results[current_index].category
-        return [
-            i
-            for i, result in enumerate(results)
-            if result.category == current_category
-        ]
+        by_category, _flagged = self._index_categories(results)
+        return list(by_category[results[current_index].category])
+
+
+def _is_fusable(pattern: re.Pattern[str]) -> bool:
+    """Check if a pattern keeps its meaning as one branch of an alternation."""
+    return pattern.flags == _DEFAULT_RE_FLAGS and _BACKREFERENCE.search(pattern.pattern) is None
+
+
+def _literal_flags(entries: list[tuple[re.Pattern[str], Flag]]) -> dict[str, Flag] | None:
+    """Map literal flag patterns to their flags, first pattern winning.
+
+    Args:
+        entries: (pattern, flag) pairs in match order
+
+    Returns:
+        Dict of literal string to flag, or None if any pattern is not literal
+    """
+    literals: dict[str, Flag] = {}
+    for pattern, flag in entries:
+        if pattern.flags != _DEFAULT_RE_FLAGS or not _LITERAL_PATTERN.fullmatch(pattern.pattern):
+            return None
+        literals.setdefault(pattern.pattern[1:-1], flag)
+    return literals
+
+
+def _match_literal(
+    literal_flags: dict[str, Flag], value: str
+) -> tuple[str, Flag | None, tuple[CaptureGroup, ...]]:
+    """Match a token value against literal flag patterns (see Matcher._match_value)."""
+    flag = literal_flags.get(value)
+    if flag is None and value.endswith("\n"):
+        # '$' also matches before a trailing newline
+        flag = literal_flags.get(value[:-1])
+
+    groups = (CaptureGroup(value=value, start=0, end=len(value), group_index=0),)
+    if flag is None:
+        return "Default", None, groups
+    return sys.intern(flag.category), flag, groups
+
+
+def _fuse_patterns(entries: list[tuple[re.Pattern[str], Flag]]) -> list[_Segment]:
+    """Combine runs of flag patterns into alternations, preserving match order.
+
+    Each pattern in a run becomes one outer group of the alternation, so the
+    match's lastindex identifies the branch that matched. A run ends where a
+    pattern cannot be fused or would redefine a group name already in it;
+    such patterns, and runs that fail to compile, are kept on their own.
+
+    Args:
+        entries: (pattern, flag) pairs in match order
+
+    Returns:
+        List of (pattern, owners) segments, where owners maps each outer group
+        index to the original pattern and flag (a single entry for a
+        pattern kept on its own)
+    """
+    segments: list[_Segment] = []
+    run: list[tuple[re.Pattern[str], Flag]] = []
+    run_names: set[str] = set()
+
+    def flush_run() -> None:
+        if len(run) > 1:
+            owners: dict[int, tuple[re.Pattern[str], Flag]] = {}
+            index = 1
+            for pattern, flag in run:
+                owners[index] = (pattern, flag)
+                index += pattern.groups + 1
+            try:
+                fused = re.compile("|".join(f"({pattern.pattern})" for pattern, _ in run))
+            except re.error:
+                segments.extend((pattern, {0: (pattern, flag)}) for pattern, flag in run)
+            else:
+                segments.append((fused, owners))
+        elif run:
+            pattern, flag = run[0]
+            segments.append((pattern, {0: (pattern, flag)}))
+        run.clear()
+        run_names.clear()
+
+    for pattern, flag in entries:
+        if not _is_fusable(pattern):
+            flush_run()
+            segments.append((pattern, {0: (pattern, flag)}))
+            continue
+        if not run_names.isdisjoint(pattern.groupindex):
+            flush_run()
+        run.append((pattern, flag))
+        run_names.update(pattern.groupindex)
+    flush_run()
+
+    return segments
 
 
 def expand_category_map(
@@ -375,6 +487,9 @@ def expand_category_map(
 ) -> list[str]:
     """Expand a category or category map to its constituent categories.
 
+    A map that (directly or indirectly) contains itself is not expanded
+    again inside its own expansion. Results are cached per config.
+
     Args:
         config: The configuration object
         category: Category or category map name
@@ -383,22 +498,38 @@ def expand_category_map(
     Returns:
         List of category names
     """
-    category_lower = category.lower()
-
-    # Check if it's a category map
-    if category_lower in config.category_maps:
-        if level == 0:
-            return [category]
-
-        cat_map = config.category_maps[category_lower]
-        result: list[str] = []
-
-        for cat in cat_map.categories:
-            # Recursively expand
-            new_level = level - 1 if level is not None else None
-            result.extend(expand_category_map(config, cat, new_level))
-
-        return result
-
-    # It's a regular category
-    return [category]
+    expansions = config._category_expansions
+    key = (category, level)
+    expansion = expansions.get(key)
+    if expansion is None:
+        expansion = expansions[key] = tuple(_expand(config, category, level))
+    return list(expansion)
+
+
+def _expand(config: Config, category: str, level: int | None) -> list[str]:
+    """Expand a category map depth-first with an explicit stack."""
+    result: list[str] = []
+    # (remaining names, their expansion level, lowercased map name or None)
+    stack: list[tuple[Iterator[str], int | None, str | None]] = [(iter((category,)), level, None)]
+    expanding: list[str] = []  # Maps on the stack, to stop cycles
+
+    while stack:
+        names, names_level, _map_name = stack[-1]
+        name = next(names, None)
+        if name is None:
+            if stack.pop()[2] is not None:
+                expanding.pop()
+            continue
+
+        name_lower = name.lower()
+        cat_map = config.category_maps.get(name_lower)
+        if cat_map is None or names_level == 0 or name_lower in expanding:
+            # A regular category, or a map that is not expanded
+            result.append(name)
+            continue
+
+        expanding.append(name_lower)
+        child_level = names_level - 1 if names_level is not None else None
+        stack.append((iter(cat_map.categories), child_level, name_lower))
+
+    return result
@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-import fnmatch
 import os
-import re
+import sys
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -39,6 +39,11 @@ BUILTIN_LAUNCHERS: dict[str, list[str]] = {
     "ionice": ["-c", "-n", "-p"],
 }
 
+# Lowercased launcher name -> (launcher name, set of flags that take an argument)
+_BUILTIN_LAUNCHERS_LOWER = {
+    name.lower(): (name, frozenset(flags)) for name, flags in BUILTIN_LAUNCHERS.items()
+}
+
 # Built-in patterns for common compilers/tools
 # Maps canonical name -> list of (pattern_type, pattern)
 BUILTIN_PROGRAMS: dict[str, list[tuple[str, str]]] = {
@@ -106,7 +111,16 @@ BUILTIN_PROGRAMS: dict[str, list[tuple[str, str]]] = {
 }
 
 
-@dataclass
+# Detected (canonical_name, source) by basename without a config; each config
+# keeps its own in Config._detections
+_DETECT_CACHE_SIZE = 256
+_builtin_detections: dict[str, tuple[str, str]] = {}
+
+# Sorted completion names without a config (see Config._program_names)
+_BUILTIN_PROGRAM_NAMES = tuple(sorted(BUILTIN_PROGRAMS))
+
+
+@dataclass(slots=True)
 class LauncherInfo:
     """Information about a detected launcher."""
 
@@ -115,7 +129,7 @@ class LauncherInfo:
     args_end_index: int  # Index after last launcher argument
 
 
-@dataclass
+@dataclass(slots=True)
 class ProgramMatch:
     """Result of program matching."""
 
@@ -126,7 +140,7 @@ class ProgramMatch:
     launcher: LauncherInfo | None = None  # Launcher if present
 
 
-@dataclass
+@dataclass(slots=True)
 class CommandLineParts:
     """Parsed command line with named parts.
 
@@ -168,30 +182,110 @@ class CommandLineParts:
         }
 
 
-def _match_builtin(basename: str) -> str | None:
+def _build_builtin_tables() -> tuple[
+    dict[str, tuple[int, str]],
+    tuple[tuple[int, str, tuple[str, ...]], ...],
+    tuple[tuple[int, str, tuple[str, ...]], ...],
+]:
+    """Index BUILTIN_PROGRAMS by pattern type, with lowercased patterns.
+
+    Each entry carries the program's rank (position in BUILTIN_PROGRAMS) so
+    that matching can keep the first-program-wins order across pattern types.
+
+    Returns:
+        Tuple of (exact, prefixes, suffixes): exact maps a name to its
+        (rank, program); prefixes and suffixes hold (rank, program, patterns)
+        per program, in rank order
+    """
+    exact: dict[str, tuple[int, str]] = {}
+    prefixes: list[tuple[int, str, tuple[str, ...]]] = []
+    suffixes: list[tuple[int, str, tuple[str, ...]]] = []
+
+    for rank, (program_name, patterns) in enumerate(BUILTIN_PROGRAMS.items()):
+        for pattern_type, pattern in patterns:
+            if pattern_type == "exact":
+                exact.setdefault(pattern.lower(), (rank, program_name))
+
+        for pattern_type_wanted, table in (("prefix", prefixes), ("suffix", suffixes)):
+            group = tuple(pattern.lower() for pattern_type, pattern in patterns if pattern_type == pattern_type_wanted)
+            if group:
+                table.append((rank, program_name, group))
+
+    return exact, tuple(prefixes), tuple(suffixes)
+
+
+_BUILTIN_EXACT_RANKED, _BUILTIN_PREFIXES, _BUILTIN_SUFFIXES = _build_builtin_tables()
+
+# Every prefix/suffix at once, to rule out a whole table with one C call
+_ALL_BUILTIN_PREFIXES = tuple(p for _, _, group in _BUILTIN_PREFIXES for p in group)
+_ALL_BUILTIN_SUFFIXES = tuple(p for _, _, group in _BUILTIN_SUFFIXES for p in group)
+
+
+def _match_builtin_affixes(
+    basename_lower: str, best: tuple[int, str] | None = None
+) -> tuple[int, str] | None:
+    """Find the earliest program whose prefix or suffix patterns match.
+
+    Args:
+        basename_lower: The lowercased executable basename
+        best: (rank, program) already matched, which only earlier programs beat
+
+    Returns:
+        (rank, program) of the earliest match, or None
+    """
+    for table, all_patterns, matches in (
+        (_BUILTIN_PREFIXES, _ALL_BUILTIN_PREFIXES, basename_lower.startswith),
+        (_BUILTIN_SUFFIXES, _ALL_BUILTIN_SUFFIXES, basename_lower.endswith),
+    ):
+        if not matches(all_patterns):
+            continue
+        for rank, program_name, patterns in table:
+            if best is not None and rank >= best[0]:
+                break
+            if matches(patterns):
+                best = (rank, program_name)
+                break
+    return best
+
+
+# Exact names resolved to their final program up front (an earlier program's
+# prefix/suffix can still claim an exact name), so a hit needs no further scan
+_BUILTIN_EXACT: dict[str, str] = {
+    name: resolved[1]
+    for name, ranked in _BUILTIN_EXACT_RANKED.items()
+    if (resolved := _match_builtin_affixes(name, ranked)) is not None
+}
+
+
+# Lowercased name -> (launcher, program) for builtin launchers and exact
+# program names; exactly one of the pair is set
+_NAME_DISPATCH: dict[str, tuple[tuple[str, frozenset[str]] | None, str | None]] = {
+    **{name: (None, program) for name, program in _BUILTIN_EXACT.items()},
+    **{name: (launcher, None) for name, launcher in _BUILTIN_LAUNCHERS_LOWER.items()},
+}
+_NO_DISPATCH: tuple[None, None] = (None, None)
+
+
+@lru_cache(maxsize=4096)
+def _match_builtin(basename_lower: str) -> str | None:
     """Try to match against built-in program patterns.
 
     Args:
-        basename: The executable basename (e.g., "arm-linux-gnueabi-gcc")
+        basename_lower: The lowercased executable basename (e.g., "arm-linux-gnueabi-gcc")
 
     Returns:
         Canonical program name or None if no match
     """
-    basename_lower = basename.lower()
+    if basename_lower.startswith("-"):
+        return None  # A flag, not a program
 
-    for program_name, patterns in BUILTIN_PROGRAMS.items():
-        for pattern_type, pattern in patterns:
-            if pattern_type == "exact":
-                if basename_lower == pattern.lower():
-                    return program_name
-            elif pattern_type == "prefix":
-                if basename_lower.startswith(pattern.lower()):
-                    return program_name
-            elif pattern_type == "suffix":
-                if basename_lower.endswith(pattern.lower()):
-                    return program_name
+    exact = _BUILTIN_EXACT.get(basename_lower)
+    if exact is not None:
+        return exact
 
-    return None
+    # Keep the earliest program matched by any pattern type
+    best = _match_builtin_affixes(basename_lower)
+    return best[1] if best is not None else None
 
 
 def _match_config(basename: str, config: Config) -> str | None:
@@ -204,30 +298,8 @@ def _match_config(basename: str, config: Config) -> str | None:
     Returns:
         Program name from config or None if no match
     """
-    for _program_name, program in config.programs.items():
-        # Check exact name match
-        if program.name.lower() == basename.lower():
-            return program.name
-
-        # Check aliases
-        for alias in program.aliases:
-            if alias.startswith("glob:"):
-                pattern = alias[5:]
-                if fnmatch.fnmatch(basename.lower(), pattern.lower()):
-                    return program.name
-            elif alias.startswith("regexp:"):
-                pattern = alias[7:]
-                try:
-                    if re.match(pattern, basename, re.IGNORECASE):
-                        return program.name
-                except re.error:
-                    continue
-            else:
-                # Literal alias
-                if alias.lower() == basename.lower():
-                    return program.name
-
-    return None
+    program = config.get_program(basename, ignore_case=True)
+    return program.name if program else None
 
 
 def detect_program(executable: str, config: Config | None = None) -> ProgramMatch | None:
@@ -237,6 +309,8 @@ def detect_program(executable: str, config: Config | None = None) -> ProgramMatc
     1. Try built-in fast matching for common compilers
     2. Fall back to config-defined regexp matching
 
+    Results are cached per basename and config.
+
     Args:
         executable: The executable path or name (e.g., "/usr/bin/arm-linux-gnueabi-gcc")
         config: Optional configuration object for custom program matching
@@ -244,37 +318,68 @@ def detect_program(executable: str, config: Config | None = None) -> ProgramMatc
     Returns:
         ProgramMatch with canonical name, or None if unknown
     """
-    # Extract basename
-    basename = os.path.basename(executable)
+    return _detect_basename(_basename(executable), config)
+
+
+def _basename(path: str) -> str:
+    """Get the last path component (os.path.basename, minus its fspath/bytes handling)."""
+    basename = path.rpartition(os.sep)[2]
+    if os.altsep:
+        basename = basename.rpartition(os.altsep)[2]
+    return basename
+
 
+def _detect_basename(basename: str, config: Config | None) -> ProgramMatch:
+    """Detect the program for an executable basename, using the detection cache."""
+    detections = _detections_for(config)
+    detection = detections.get(basename)
+    if detection is None:
+        detection = _detect(basename, config)
+        if len(detections) >= _DETECT_CACHE_SIZE:
+            detections.clear()
+        detections[basename] = detection
+
+    canonical_name, source = detection
+    return ProgramMatch(
+        canonical_name=canonical_name,
+        matched_name=basename,
+        source=source,
+    )
+
+
+def _detections_for(config: Config | None) -> dict[str, tuple[str, str]]:
+    """Get the detect_program cache for a config (or for no config)."""
+    if config is None:
+        return _builtin_detections
+
+    return config._detections
+
+
+def _detect(basename: str, config: Config | None) -> tuple[str, str]:
+    """Detect the program for a basename.
+
+    Names are interned (builtin names and sources are literals, so already
+    are), letting every cached match share one string per program.
+
+    Returns:
+        Tuple of (canonical_name, source)
+    """
     # Tier 1: Try built-in matchers (fast)
-    builtin_match = _match_builtin(basename)
+    builtin_match = _match_builtin(basename.lower())
     if builtin_match:
-        return ProgramMatch(
-            canonical_name=builtin_match,
-            matched_name=basename,
-            source="builtin",
-        )
+        return builtin_match, "builtin"
 
     # Tier 2: Try config-defined patterns
     if config:
         config_match = _match_config(basename, config)
         if config_match:
-            return ProgramMatch(
-                canonical_name=config_match,
-                matched_name=basename,
-                source="config",
-            )
+            return sys.intern(config_match), "config"
 
     # No match - return the basename as-is
-    return ProgramMatch(
-        canonical_name=basename,
-        matched_name=basename,
-        source="unknown",
-    )
+    return sys.intern(basename), "unknown"
 
 
-def _is_launcher(basename: str, config: Config | None = None) -> tuple[str, list[str]] | None:
+def _is_launcher(basename: str, config: Config | None = None) -> tuple[str, frozenset[str]] | None:
     """Check if basename is a known launcher.
 
     Args:
@@ -282,26 +387,36 @@ def _is_launcher(basename: str, config: Config | None = None) -> tuple[str, list
         config: Optional config for user-defined launchers
 
     Returns:
-        Tuple of (launcher_name, flags_with_args) or None
+        Tuple of (launcher_name, flags_with_args) or None, flags_with_args
+        being the set of launcher flags that take a separate argument
     """
     basename_lower = basename.lower()
 
     # Check built-in launchers
-    for launcher, flags_with_args in BUILTIN_LAUNCHERS.items():
-        if basename_lower == launcher.lower():
-            return launcher, flags_with_args
-
-    # Check config-defined launchers
-    if config and hasattr(config, "launchers"):
-        for launcher_name, launcher_def in config.launchers.items():
-            if basename_lower == launcher_name.lower():
-                return launcher_name, getattr(launcher_def, "flags_with_args", [])
-            # Check aliases
-            for alias in getattr(launcher_def, "aliases", []):
-                if basename_lower == alias.lower():
-                    return launcher_name, getattr(launcher_def, "flags_with_args", [])
+    builtin = _BUILTIN_LAUNCHERS_LOWER.get(basename_lower)
+    if builtin is not None:
+        return builtin
+
+    return _match_config_launcher(basename_lower, config) if config else None
 
-    return None
+
+def _match_config_launcher(basename_lower: str, config: Config) -> tuple[str, frozenset[str]] | None:
+    """Check if a lowercased basename is a config-defined launcher."""
+    return _launchers_for(config).get(basename_lower)
+
+
+def _launchers_for(config: Config) -> dict[str, tuple[str, frozenset[str]]]:
+    """Get a config's launchers by lowercased name and alias, built once per config."""
+    launchers = config._launchers
+    if launchers is None:
+        launchers = {}
+        for launcher_name, launcher_def in getattr(config, "launchers", {}).items():
+            launcher = (launcher_name, frozenset(getattr(launcher_def, "flags_with_args", ())))
+            launchers.setdefault(launcher_name.lower(), launcher)
+            for alias in getattr(launcher_def, "aliases", []):
+                launchers.setdefault(alias.lower(), launcher)
+        config._launchers = launchers
+    return launchers
 
 
 def find_compiler(
@@ -332,10 +447,23 @@ def find_compiler(
 
     while i < len(tokens):
         token = tokens[i]
-        basename = os.path.basename(token.value)
+        basename = _basename(token.value)
+
+        # One probe answers both "builtin launcher?" and "builtin exact name?"
+        basename_lower = basename.lower()
+        launcher_check, builtin_program = _NAME_DISPATCH.get(basename_lower, _NO_DISPATCH)
+        if builtin_program is not None:
+            return ProgramMatch(
+                canonical_name=builtin_program,
+                matched_name=basename,
+                source="builtin",
+                token_index=i,
+                launcher=launcher_info,
+            )
+        if launcher_check is None and config:
+            launcher_check = _match_config_launcher(basename_lower, config)
 
         # Check if this is a launcher
-        launcher_check = _is_launcher(basename, config)
         if launcher_check:
             launcher_name, flags_with_args = launcher_check
             launcher_start = i
@@ -343,17 +471,12 @@ def find_compiler(
 
             # Skip launcher arguments
             while i < len(tokens):
-                arg_token = tokens[i]
+                arg_value = tokens[i].value
                 # If it looks like a flag, check if launcher owns it
-                if arg_token.value.startswith("-"):
-                    # Check if this flag takes an argument
-                    flag_takes_arg = False
-                    for flag in flags_with_args:
-                        if arg_token.value == flag or arg_token.value.startswith(flag + "="):
-                            flag_takes_arg = True
-                            break
-
-                    if flag_takes_arg and "=" not in arg_token.value:
+                if arg_value.startswith("-"):
+                    # A flag taking an argument consumes the next token, unless
+                    # the value was attached with "--flag=value"
+                    if arg_value in flags_with_args:
                         # Skip the flag and its argument
                         i += 2
                     else:
@@ -370,9 +493,9 @@ def find_compiler(
             )
             continue
 
-        # Not a launcher - try to detect as a program
-        program_match = detect_program(token.value, config)
-        if program_match:
+        # Not a launcher - try to detect as a program (a flag never is one)
+        if not token.value.startswith("-"):
+            program_match = _detect_basename(basename, config)
             program_match.token_index = i
             program_match.launcher = launcher_info
             return program_match
@@ -397,23 +520,22 @@ def get_program_names(config: Config | None = None) -> list[str]:
         config: Optional configuration object
 
     Returns:
-        List of program names (built-in + config-defined)
+        List of program names (built-in + config-defined); the sorted names
+        are built once per config and each call returns a new list
     """
-    names: set[str] = set()
+    if not config:
+        return list(_BUILTIN_PROGRAM_NAMES)
 
-    # Add built-in program names
-    names.update(BUILTIN_PROGRAMS.keys())
-
-    # Add config-defined programs
-    if config:
+    if config._program_names is None:
+        names = set(_BUILTIN_PROGRAM_NAMES)
         for program in config.programs.values():
             names.add(program.name)
             # Add literal aliases
             for alias in program.aliases:
                 if not alias.startswith(("glob:", "regexp:")):
                     names.add(alias)
-
-    return sorted(names)
+        config._program_names = tuple(sorted(names))
+    return list(config._program_names)
 
 
 def parse_command_line(
@@ -452,7 +574,14 @@ def parse_command_line(
         # No program found - return empty
         return CommandLineParts()
 
-    parts = CommandLineParts()
+    # find_compiler already located every part; only the joins are left
+    values = [t.value for t in tokens]
+    program_idx = program_match.token_index
+    parts = CommandLineParts(
+        # Program executable
+        program=values[program_idx],
+        program_range=(program_idx, program_idx + 1),
+    )
 
     # Check if there's a launcher
     if program_match.launcher:
@@ -460,24 +589,17 @@ def parse_command_line(
         launcher_end = program_match.launcher.args_end_index
 
         # Launcher executable
-        parts.launcher = tokens[launcher_idx].value
+        parts.launcher = values[launcher_idx]
         parts.launcher_range = (launcher_idx, launcher_idx + 1)
 
         # Launcher parameters (tokens between launcher and program)
         if launcher_end > launcher_idx + 1:
-            launcher_param_tokens = tokens[launcher_idx + 1:launcher_end]
-            parts.launcher_parameters = " ".join(t.value for t in launcher_param_tokens)
+            parts.launcher_parameters = " ".join(values[launcher_idx + 1:launcher_end])
             parts.launcher_parameters_range = (launcher_idx + 1, launcher_end)
 
-    # Program executable
-    program_idx = program_match.token_index
-    parts.program = tokens[program_idx].value
-    parts.program_range = (program_idx, program_idx + 1)
-
     # Program parameters (everything after program)
-    if program_idx + 1 < len(tokens):
-        program_param_tokens = tokens[program_idx + 1:]
-        parts.program_parameters = " ".join(t.value for t in program_param_tokens)
-        parts.program_parameters_range = (program_idx + 1, len(tokens))
+    if program_idx + 1 < len(values):
+        parts.program_parameters = " ".join(values[program_idx + 1:])
+        parts.program_parameters_range = (program_idx + 1, len(values))
 
     return parts
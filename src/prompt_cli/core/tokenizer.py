@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import re
+import sys
 from dataclasses import dataclass
 from enum import Enum, auto
+from functools import lru_cache
 
 
 class QuoteType(Enum):
@@ -14,10 +17,12 @@ class QuoteType(Enum):
     DOUBLE = auto()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Token:
     """A token from the command line.
 
+    Tokens are immutable, so tokenize() can share them between calls.
+
     Attributes:
         value: The token value (without quotes if quoted)
         start: Start position in original string
@@ -34,7 +39,7 @@ class Token:
 
     def __post_init__(self) -> None:
         if not self.raw:
-            self.raw = self.value
+            object.__setattr__(self, "raw", self.value)
 
     @property
     def is_quoted(self) -> bool:
@@ -47,8 +52,43 @@ class Token:
         return self.end - self.start
 
 
+# One command line token. A token starting with a quote runs to the closing
+# quote (or the end of the text); any other token runs to unescaped
+# whitespace, taking embedded quoted sections (e.g., -fname="value") along.
+# A backslash always takes the next character with it.
+_TOKEN = re.compile(
+    r"""
+    "(?P<double>[^"\\]*(?:\\.?[^"\\]*)*)"?
+    | '(?P<single>[^'\\]*(?:\\.?[^'\\]*)*)'?
+    | (?:[^ \t\\"']+ | \\.? | "[^"\\]*(?:\\.?[^"\\]*)*"? | '[^'\\]*(?:\\.?[^'\\]*)*'?)+
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+
+# Token values up to this length are interned
+_INTERN_MAX_LENGTH = 32
+
+# A token in text without quotes or backslashes
+_PLAIN_TOKEN = re.compile(r"[^ \t]+")
+
+# The parts of an unquoted token that decode to something else: escaped
+# whitespace, backslash or quotes, and embedded double/single quoted sections
+_UNQUOTED_SPECIAL = re.compile(
+    r"""\\([ \t\\'"])|"([^"\\]*(?:\\.?[^"\\]*)*)"?|'([^'\\]*(?:\\.?[^'\\]*)*)'?""",
+    re.DOTALL,
+)
+
+
+# Finds a character that the shell would treat specially
+_NEEDS_QUOTING = re.compile(r"""[ \t\n\r"'\\$`!|&;()<>]""").search
+
+
 class Tokenizer:
-    """Tokenizer for command lines with quote handling."""
+    """Tokenizer for command lines with quote handling.
+
+    Tokens are found with a single regex scan; only values containing
+    quotes or backslashes need a second pass to decode.
+    """
 
     def __init__(self, text: str) -> None:
         self.text = text
@@ -57,148 +97,95 @@ class Tokenizer:
 
     def tokenize(self) -> list[Token]:
         """Tokenize the command line into tokens."""
-        tokens: list[Token] = []
-
-        while self.pos < self.length:
-            # Skip whitespace
-            self._skip_whitespace()
-            if self.pos >= self.length:
-                break
-
-            # Parse next token
-            token = self._parse_token()
-            if token:
-                tokens.append(token)
-
+        text = self.text
+        if "\\" not in text and '"' not in text and "'" not in text:
+            # Fast path: nothing to decode, every token is its own raw text
+            tokens = []
+            for match in _PLAIN_TOKEN.finditer(text, self.pos):
+                value = _intern_value(match.group())
+                tokens.append(Token(value, match.start(), match.end(), QuoteType.NONE, value))
+        else:
+            tokens = [self._make_token(match) for match in _TOKEN.finditer(text, self.pos)]
+        self.pos = self.length
         return tokens
 
-    def _skip_whitespace(self) -> None:
-        """Skip whitespace characters."""
-        while self.pos < self.length and self.text[self.pos] in " \t":
-            self.pos += 1
-
-    def _parse_token(self) -> Token | None:
-        """Parse a single token."""
-        if self.pos >= self.length:
-            return None
-
-        start = self.pos
-        char = self.text[self.pos]
-
-        # Handle quoted strings
-        if char in "\"'":
-            return self._parse_quoted(start, char)
-
-        # Handle unquoted token (may contain embedded quotes)
-        return self._parse_unquoted(start)
-
-    def _parse_quoted(self, start: int, quote_char: str) -> Token:
-        """Parse a quoted string."""
-        self.pos += 1  # Skip opening quote
-        value_parts: list[str] = []
-
-        while self.pos < self.length:
-            char = self.text[self.pos]
-
-            if char == "\\":
-                # Handle escape sequences
-                if self.pos + 1 < self.length:
-                    next_char = self.text[self.pos + 1]
-                    if next_char in (quote_char, "\\"):
-                        value_parts.append(next_char)
-                        self.pos += 2
-                        continue
-                value_parts.append(char)
-                self.pos += 1
-            elif char == quote_char:
-                # End of quoted string
-                self.pos += 1
-                break
-            else:
-                value_parts.append(char)
-                self.pos += 1
-
-        value = "".join(value_parts)
-        raw = self.text[start : self.pos]
-        quote_type = QuoteType.DOUBLE if quote_char == '"' else QuoteType.SINGLE
+    def _make_token(self, match: re.Match[str]) -> Token:
+        """Build a token from its match."""
+        double, single = match.group("double", "single")
+        if double is not None:
+            value = _unescape_quoted(double, '"')
+            quote_type = QuoteType.DOUBLE
+        elif single is not None:
+            value = _unescape_quoted(single, "'")
+            quote_type = QuoteType.SINGLE
+        else:
+            value, quote_type = _decode_unquoted(match.group())
 
         return Token(
-            value=value,
-            start=start,
-            end=self.pos,
+            value=_intern_value(value),
+            start=match.start(),
+            end=match.end(),
             quote_type=quote_type,
-            raw=raw,
+            raw=match.group(),
         )
 
-    def _parse_unquoted(self, start: int) -> Token:
-        """Parse an unquoted token (may contain embedded quoted sections)."""
-        value_parts: list[str] = []
-        has_embedded_quote = False
-
-        while self.pos < self.length:
-            char = self.text[self.pos]
-
-            if char in " \t":
-                # End of token at whitespace
-                break
-
-            if char == "\\":
-                # Handle escape sequences
-                if self.pos + 1 < self.length:
-                    next_char = self.text[self.pos + 1]
-                    if next_char in " \t\\'\"":
-                        value_parts.append(next_char)
-                        self.pos += 2
-                        continue
-                value_parts.append(char)
-                self.pos += 1
-
-            elif char in "\"'":
-                # Handle embedded quoted section (e.g., -fname="value")
-                has_embedded_quote = True
-                quote_char = char
-                self.pos += 1  # Skip opening quote
-
-                while self.pos < self.length:
-                    inner_char = self.text[self.pos]
-                    if inner_char == "\\":
-                        if self.pos + 1 < self.length:
-                            next_char = self.text[self.pos + 1]
-                            if next_char in (quote_char, "\\"):
-                                value_parts.append(next_char)
-                                self.pos += 2
-                                continue
-                        value_parts.append(inner_char)
-                        self.pos += 1
-                    elif inner_char == quote_char:
-                        self.pos += 1  # Skip closing quote
-                        break
-                    else:
-                        value_parts.append(inner_char)
-                        self.pos += 1
-            else:
-                value_parts.append(char)
-                self.pos += 1
-
-        value = "".join(value_parts)
-        raw = self.text[start : self.pos]
-
-        # Determine quote type based on content
-        quote_type = QuoteType.NONE
-        if has_embedded_quote:
-            # Check which quote type was used
-            if '"' in raw:
-                quote_type = QuoteType.DOUBLE
-            elif "'" in raw:
-                quote_type = QuoteType.SINGLE
 
-        return Token(
-            value=value,
-            start=start,
-            end=self.pos,
-            quote_type=quote_type,
-            raw=raw,
-        )
+def _intern_value(value: str) -> str:
+    """Intern a short ASCII token value.
+
+    Command lines repeat the same flags (-c, -o, -Wall), so their tokens
+    share one string each and compare by identity first.
+    """
+    if len(value) <= _INTERN_MAX_LENGTH and value.isascii():
+        return sys.intern(value)
+    return value
+
+
+def _unescape_quoted(value: str, quote_char: str) -> str:
+    """Undo escaped quotes and backslashes in a quoted section.
+
+    Any other backslash is kept as is.
+    """
+    if "\\" not in value:
+        return value
+    # Escaped backslashes pair up left to right, exactly like split() does
+    escaped_quote = "\\" + quote_char
+    return "\\".join([part.replace(escaped_quote, quote_char) for part in value.split("\\\\")])
+
+
+def _decode_unquoted(raw: str) -> tuple[str, QuoteType]:
+    """Decode an unquoted token (may contain embedded quoted sections).
+
+    Returns:
+        Tuple of (value, quote_type)
+    """
+    if "\\" not in raw and '"' not in raw and "'" not in raw:
+        return raw, QuoteType.NONE
+
+    has_embedded_quote = False
+
+    def decode(special: re.Match[str]) -> str:
+        nonlocal has_embedded_quote
+        escaped, double, single = special.groups()
+        if escaped is not None:
+            return escaped
+        has_embedded_quote = True
+        if double is not None:
+            return _unescape_quoted(double, '"')
+        return _unescape_quoted(single, "'")
+
+    value = _UNQUOTED_SPECIAL.sub(decode, raw)
+
+    # Determine quote type based on content
+    quote_type = QuoteType.NONE
+    if has_embedded_quote:
+        # Check which quote type was used
+        if '"' in raw:
+            quote_type = QuoteType.DOUBLE
+        elif "'" in raw:
+            quote_type = QuoteType.SINGLE
+
+    return value, quote_type
 
 
 def tokenize(text: str) -> list[Token]:
@@ -219,7 +206,14 @@ def tokenize(text: str) -> list[Token]:
         >>> [t.value for t in tokens]
         ['gcc', '-DNAME=hello world', 'main.c']
     """
-    return Tokenizer(text).tokenize()
+    return list(_tokenize_cached(text))
+
+
+# The editor re-tokenizes an unchanged buffer for every command and redraw
+@lru_cache(maxsize=1024)
+def _tokenize_cached(text: str) -> tuple[Token, ...]:
+    """Tokenize a command line once per distinct text."""
+    return tuple(Tokenizer(text).tokenize())
 
 
 def detokenize(tokens: list[Token]) -> str:
@@ -233,7 +227,7 @@ def detokenize(tokens: list[Token]) -> str:
     Returns:
         Command line string
     """
-    return " ".join(token.raw for token in tokens)
+    return " ".join([token.raw for token in tokens])
 
 
 def rebuild_command(tokens: list[Token]) -> str:
@@ -248,25 +242,22 @@ def rebuild_command(tokens: list[Token]) -> str:
     parts: list[str] = []
 
     for token in tokens:
-        if needs_quoting(token.value):
-            # Quote the value
-            if '"' not in token.value:
-                parts.append(f'"{token.value}"')
-            elif "'" not in token.value:
-                parts.append(f"'{token.value}'")
-            else:
-                # Escape double quotes
-                escaped = token.value.replace("\\", "\\\\").replace('"', '\\"')
-                parts.append(f'"{escaped}"')
+        value = token.value
+        if value and _NEEDS_QUOTING(value) is None:  # needs_quoting(), inlined
+            parts.append(value)
+        # Quote the value
+        elif '"' not in value:
+            parts.append(f'"{value}"')
+        elif "'" not in value:
+            parts.append(f"'{value}'")
         else:
-            parts.append(token.value)
+            # Escape double quotes
+            escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+            parts.append(f'"{escaped}"')
 
     return " ".join(parts)
 
 
 def needs_quoting(value: str) -> bool:
     """Check if a value needs quoting."""
-    if not value:
-        return True
-    special_chars = set(" \t\n\r\"'\\$`!|&;()<>")
-    return any(c in special_chars for c in value)
+    return not value or _NEEDS_QUOTING(value) is not None
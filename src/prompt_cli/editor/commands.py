@@ -3,16 +3,32 @@
 from __future__ import annotations
 
 import os
-import shlex
+import re
 import subprocess
 import tempfile
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
+from prompt_cli.core.tokenizer import tokenize
+
 if TYPE_CHECKING:
     from prompt_cli.editor.prompt import CommandLineEditor
 
+# Characters that separate words and parameters on the command line
+_WHITESPACE = frozenset(" \t")
+
+# The rest of the current word and the whitespace after it
+_WORD_RIGHT = re.compile(r"[^ \t]*[ \t]*")
+
+
+@dataclass(slots=True)
+class _AbbreviationNode:
+    """A node in the command name trie, one level per '-'-separated word."""
+
+    children: dict[str, _AbbreviationNode] = field(default_factory=dict)
+    names: list[str] = field(default_factory=list)  # Commands ending here
+
 
 @dataclass
 class CommandResult:
@@ -30,23 +46,29 @@ class CommandRegistry:
 
     def __init__(self) -> None:
         self._commands: dict[str, Callable[..., CommandResult]] = {}
-        self._command_words: dict[str, set[str]] = {}  # For abbreviation matching
+        self._abbreviations = _AbbreviationNode()  # For abbreviation matching
+        self._command_order: dict[str, int] = {}  # Registration order
 
     def register(self, name: str) -> Callable[[Callable[..., CommandResult]], Callable[..., CommandResult]]:
         """Decorator to register a command."""
         def decorator(func: Callable[..., CommandResult]) -> Callable[..., CommandResult]:
             self._commands[name] = func
             # Index words for abbreviation matching
-            words = name.split("-")
-            self._command_words[name] = set(words)
+            if name not in self._command_order:
+                self._command_order[name] = len(self._command_order)
+                node = self._abbreviations
+                for word in name.split("-"):
+                    node = node.children.setdefault(word, _AbbreviationNode())
+                node.names.append(name)
             return func
         return decorator
 
     def get(self, name: str) -> Callable[..., CommandResult] | None:
         """Get a command by name or abbreviation."""
         # Exact match first
-        if name in self._commands:
-            return self._commands[name]
+        command = self._commands.get(name)
+        if command is not None:
+            return command
 
         # Try abbreviation matching
         matches = self._match_abbreviation(name)
@@ -58,27 +80,34 @@ class CommandRegistry:
         return None
 
     def _match_abbreviation(self, abbrev: str) -> list[str]:
-        """Match command abbreviation to full names."""
-        abbrev_parts = abbrev.split("-")
-        matches: list[str] = []
+        """Match command abbreviation to full names.
 
-        for cmd_name in self._commands:
-            cmd_parts = cmd_name.split("-")
+        Each abbreviation part must be a prefix of the command's word at the
+        same position; commands may have more words than the abbreviation.
 
-            if len(abbrev_parts) > len(cmd_parts):
-                continue
-
-            # Check if each abbreviation part matches the start of command part
-            match = True
-            for i, abbrev_part in enumerate(abbrev_parts):
-                if i >= len(cmd_parts) or not cmd_parts[i].startswith(abbrev_part):
-                    match = False
-                    break
-
-            if match:
-                matches.append(cmd_name)
+        Returns:
+            Matching command names, in registration order
+        """
+        # Walk down one trie level per abbreviation part
+        nodes = [self._abbreviations]
+        for abbrev_part in abbrev.split("-"):
+            nodes = [
+                child
+                for node in nodes
+                for word, child in node.children.items()
+                if word.startswith(abbrev_part)
+            ]
+            if not nodes:
+                return []
+
+        # Every command below the matched nodes matches
+        matches: list[str] = []
+        while nodes:
+            node = nodes.pop()
+            matches.extend(node.names)
+            nodes.extend(node.children.values())
 
-        return matches
+        return sorted(matches, key=self._command_order.__getitem__)
 
     def list_commands(self) -> list[str]:
         """List all registered command names."""
@@ -117,15 +146,30 @@ def parse_command_string(cmd_string: str) -> tuple[str, list[str]]:
     Args:
         cmd_string: Command string like "quit -p -y"
 
+    Quoting follows the command line tokenizer, so an unterminated quote
+    runs to the end of the string rather than raising an error.
+
     Returns:
         Tuple of (command_name, arguments)
     """
-    parts = shlex.split(cmd_string)
+    parts = [token.value for token in tokenize(cmd_string)]
     if not parts:
         return "", []
     return parts[0], parts[1:]
 
 
+def _word_right_end(text: str, pos: int) -> int:
+    """Get the position after the current word and the whitespace after it."""
+    match = _WORD_RIGHT.match(text, pos)
+    return match.end() if match else pos
+
+
+def _word_left_start(text: str, pos: int) -> int:
+    """Get the start of the word before pos, skipping whitespace before pos."""
+    head = text[:pos].rstrip(" \t")
+    return max(head.rfind(" "), head.rfind("\t")) + 1
+
+
 # Navigation commands
 
 @commands.register("move-char-left")
@@ -150,18 +194,7 @@ def move_char_right(editor: CommandLineEditor, args: list[str]) -> CommandResult
 def move_word_left(editor: CommandLineEditor, args: list[str]) -> CommandResult:
     """Move cursor one word left."""
     buffer = editor.buffer
-    text = buffer.text
-    pos = buffer.cursor_position
-
-    # Skip whitespace
-    while pos > 0 and text[pos - 1] in " \t":
-        pos -= 1
-
-    # Skip word characters
-    while pos > 0 and text[pos - 1] not in " \t":
-        pos -= 1
-
-    buffer.cursor_position = pos
+    buffer.cursor_position = _word_left_start(buffer.text, buffer.cursor_position)
     return CommandResult()
 
 
@@ -169,19 +202,7 @@ def move_word_left(editor: CommandLineEditor, args: list[str]) -> CommandResult:
 def move_word_right(editor: CommandLineEditor, args: list[str]) -> CommandResult:
     """Move cursor one word right."""
     buffer = editor.buffer
-    text = buffer.text
-    pos = buffer.cursor_position
-    length = len(text)
-
-    # Skip current word characters
-    while pos < length and text[pos] not in " \t":
-        pos += 1
-
-    # Skip whitespace
-    while pos < length and text[pos] in " \t":
-        pos += 1
-
-    buffer.cursor_position = pos
+    buffer.cursor_position = _word_right_end(buffer.text, buffer.cursor_position)
     return CommandResult()
 
 
@@ -258,17 +279,8 @@ def delete_char_left(editor: CommandLineEditor, args: list[str]) -> CommandResul
 def delete_word_left(editor: CommandLineEditor, args: list[str]) -> CommandResult:
     """Delete word before cursor."""
     buffer = editor.buffer
-    text = buffer.text
-    pos = buffer.cursor_position
-    start_pos = pos
-
-    # Skip whitespace
-    while pos > 0 and text[pos - 1] in " \t":
-        pos -= 1
-
-    # Skip word characters
-    while pos > 0 and text[pos - 1] not in " \t":
-        pos -= 1
+    start_pos = buffer.cursor_position
+    pos = _word_left_start(buffer.text, start_pos)
 
     # Delete from pos to start_pos
     if pos < start_pos:
@@ -282,18 +294,8 @@ def delete_word_left(editor: CommandLineEditor, args: list[str]) -> CommandResul
 def delete_word_right(editor: CommandLineEditor, args: list[str]) -> CommandResult:
     """Delete word after cursor."""
     buffer = editor.buffer
-    text = buffer.text
     pos = buffer.cursor_position
-    length = len(text)
-    end_pos = pos
-
-    # Skip current word characters
-    while end_pos < length and text[end_pos] not in " \t":
-        end_pos += 1
-
-    # Skip whitespace
-    while end_pos < length and text[end_pos] in " \t":
-        end_pos += 1
+    end_pos = _word_right_end(buffer.text, pos)
 
     # Delete from pos to end_pos
     if end_pos > pos:
@@ -315,7 +317,7 @@ def delete_param(editor: CommandLineEditor, args: list[str]) -> CommandResult:
             # Delete token and trailing whitespace
             delete_len = token.end - token.start
             text = editor.buffer.text
-            while token.start + delete_len < len(text) and text[token.start + delete_len] in " \t":
+            while token.start + delete_len < len(text) and text[token.start + delete_len] in _WHITESPACE:
                 delete_len += 1
             editor.buffer.delete(count=delete_len)
             return CommandResult()
@@ -432,92 +434,36 @@ def quit_editor(editor: CommandLineEditor, args: list[str]) -> CommandResult:
 
 # Duplicates mode commands
 
-@commands.register("duplicate-prev")
-def duplicate_prev(editor: CommandLineEditor, args: list[str]) -> CommandResult:
-    """Move to previous duplicate in current group."""
-    if editor.duplicates_mode:
-        editor.duplicates_mode.move_prev()
-    return CommandResult()
-
-
-@commands.register("duplicate-next")
-def duplicate_next(editor: CommandLineEditor, args: list[str]) -> CommandResult:
-    """Move to next duplicate in current group."""
-    if editor.duplicates_mode:
-        editor.duplicates_mode.move_next()
-    return CommandResult()
-
-
-@commands.register("duplicate-previous-group")
-def duplicate_previous_group(editor: CommandLineEditor, args: list[str]) -> CommandResult:
-    """Move to previous duplicate group."""
-    if editor.duplicates_mode:
-        editor.duplicates_mode.prev_group()
-    return CommandResult()
+# Command name -> (DuplicatesMode method, description)
+_DUPLICATES_MODE_COMMANDS: dict[str, tuple[str, str]] = {
+    "duplicate-prev": ("move_prev", "Move to previous duplicate in current group."),
+    "duplicate-next": ("move_next", "Move to next duplicate in current group."),
+    "duplicate-previous-group": ("prev_group", "Move to previous duplicate group."),
+    "duplicate-next-group": ("next_group", "Move to next duplicate group."),
+    "duplicate-select": ("select_group", "Select current duplicate group."),
+    "duplicate-deselect": ("deselect_group", "Deselect current duplicate group."),
+    "duplicate-all": ("select_all", "Select all duplicate groups."),
+    "duplicate-none": ("deselect_all", "Deselect all duplicate groups."),
+    "duplicates-keep": ("keep_current", "Keep current duplicate, delete others in selected groups."),
+    "duplicates-delete": ("delete_current", "Delete current duplicate."),
+    "duplicates-first": ("keep_first", "Keep first duplicate in selected groups."),
+}
 
 
-@commands.register("duplicate-next-group")
-def duplicate_next_group(editor: CommandLineEditor, args: list[str]) -> CommandResult:
-    """Move to next duplicate group."""
-    if editor.duplicates_mode:
-        editor.duplicates_mode.next_group()
-    return CommandResult()
+def _duplicates_mode_command(method: str, description: str) -> Callable[..., CommandResult]:
+    """Create a command calling a DuplicatesMode method, if the mode is active."""
 
+    def command(editor: CommandLineEditor, args: list[str]) -> CommandResult:
+        if editor.duplicates_mode:
+            getattr(editor.duplicates_mode, method)()
+        return CommandResult()
 
-@commands.register("duplicate-select")
-def duplicate_select(editor: CommandLineEditor, args: list[str]) -> CommandResult:
-    """Select current duplicate group."""
-    if editor.duplicates_mode:
-        editor.duplicates_mode.select_group()
-    return CommandResult()
-
-
-@commands.register("duplicate-deselect")
-def duplicate_deselect(editor: CommandLineEditor, args: list[str]) -> CommandResult:
-    """Deselect current duplicate group."""
-    if editor.duplicates_mode:
-        editor.duplicates_mode.deselect_group()
-    return CommandResult()
+    command.__doc__ = description
+    return command
 
 
-@commands.register("duplicate-all")
-def duplicate_all(editor: CommandLineEditor, args: list[str]) -> CommandResult:
-    """Select all duplicate groups."""
-    if editor.duplicates_mode:
-        editor.duplicates_mode.select_all()
-    return CommandResult()
-
-
-@commands.register("duplicate-none")
-def duplicate_none(editor: CommandLineEditor, args: list[str]) -> CommandResult:
-    """Deselect all duplicate groups."""
-    if editor.duplicates_mode:
-        editor.duplicates_mode.deselect_all()
-    return CommandResult()
-
-
-@commands.register("duplicates-keep")
-def duplicates_keep(editor: CommandLineEditor, args: list[str]) -> CommandResult:
-    """Keep current duplicate, delete others in selected groups."""
-    if editor.duplicates_mode:
-        editor.duplicates_mode.keep_current()
-    return CommandResult()
-
-
-@commands.register("duplicates-delete")
-def duplicates_delete(editor: CommandLineEditor, args: list[str]) -> CommandResult:
-    """Delete current duplicate."""
-    if editor.duplicates_mode:
-        editor.duplicates_mode.delete_current()
-    return CommandResult()
-
-
-@commands.register("duplicates-first")
-def duplicates_first(editor: CommandLineEditor, args: list[str]) -> CommandResult:
-    """Keep first duplicate in selected groups."""
-    if editor.duplicates_mode:
-        editor.duplicates_mode.keep_first()
-    return CommandResult()
+for _name, (_method, _description) in _DUPLICATES_MODE_COMMANDS.items():
+    commands.register(_name)(_duplicates_mode_command(_method, _description))
 
 
 @commands.register("duplicates-exit")
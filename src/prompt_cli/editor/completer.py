@@ -3,8 +3,13 @@
 from __future__ import annotations
 
 import os
+import stat
+import time
+from bisect import bisect_left, bisect_right
 from collections.abc import Iterable
-from typing import TYPE_CHECKING
+from functools import lru_cache
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any
 
 from prompt_toolkit.completion import Completer, Completion
 from prompt_toolkit.document import Document
@@ -20,29 +25,106 @@ from prompt_cli.validators.warnings import WarningsValidator
 if TYPE_CHECKING:
     from prompt_cli.config.schema import Config
 
+_token_start = attrgetter("start")
+
+# Seconds a looked-up working directory is reused for completions
+_CWD_TTL = 0.5
+
+# Executables found in each PATH directory: dir -> (st_mtime_ns, names)
+_path_dir_cache: dict[str, tuple[int, tuple[str, ...]]] = {}
+
+# Merged index for the current PATH, keyed by its (dir, st_mtime_ns) pairs
+_path_index_cache: dict[tuple[tuple[str, int], ...], tuple[list[str], list[str]]] = {}
+
+
+def _scan_path_dir(path_dir: str) -> tuple[str, ...]:
+    """List the executable files in a PATH directory.
+
+    Each entry costs a single stat: its mode tells both whether it is a
+    regular file and whether any execute bit is set. Symlinks are followed,
+    since PATH directories are full of them.
+    """
+    names: list[str] = []
+    try:
+        with os.scandir(path_dir) as it:
+            for entry in it:
+                try:
+                    mode = entry.stat().st_mode
+                except OSError:
+                    continue
+                if stat.S_ISREG(mode) and mode & 0o111:
+                    names.append(entry.name)
+    except OSError:
+        pass
+    return tuple(names)
+
+
+@lru_cache(maxsize=8)
+def _split_path(path: str) -> tuple[str, ...]:
+    """Split a PATH value into its directories."""
+    return tuple(path.split(os.pathsep))
+
+
+def _path_executables(path: str) -> tuple[list[str], list[str]]:
+    """Get the executables on a PATH, sorted case-insensitively.
+
+    A directory is only rescanned when its mtime changes, so a warm lookup
+    costs one stat per PATH entry. Names found in an earlier directory
+    shadow later ones.
+
+    Returns:
+        Tuple of (lowercased names, names), in the same order
+    """
+    dirs: list[tuple[str, int]] = []
+    for path_dir in _split_path(path):
+        try:
+            st = os.stat(path_dir)
+        except OSError:
+            continue
+        if stat.S_ISDIR(st.st_mode):
+            dirs.append((path_dir, st.st_mtime_ns))
+
+    key = tuple(dirs)
+    index = _path_index_cache.get(key)
+    if index is not None:
+        return index
+
+    seen: set[str] = set()
+    entries: list[tuple[str, str]] = []
+    for path_dir, mtime in key:
+        cached = _path_dir_cache.get(path_dir)
+        if cached is None or cached[0] != mtime:
+            cached = _path_dir_cache[path_dir] = (mtime, _scan_path_dir(path_dir))
+        for name in cached[1]:
+            if name not in seen:
+                seen.add(name)
+                entries.append((name.lower(), name))
+
+    entries.sort()
+    index = ([lowered for lowered, _ in entries], [name for _, name in entries])
+    _path_index_cache.clear()
+    _path_index_cache[key] = index
+    return index
+
+
+# Validator classes by the "type" key of their configuration
+_VALIDATOR_TYPES: dict[str, type[Validator]] = {
+    "file": FileValidator,
+    "directory": DirectoryValidator,
+    "choice": ChoiceValidator,
+    "multiple-choice": MultipleChoiceValidator,
+    "warnings": WarningsValidator,
+    "custom": CustomValidator,
+}
+
 
 def create_validator(config: dict | None) -> Validator | None:
     """Create a validator instance from configuration."""
     if config is None:
         return None
 
-    validator_type = config.get("type", "file")
-
-    match validator_type:
-        case "file":
-            return FileValidator(config)
-        case "directory":
-            return DirectoryValidator(config)
-        case "choice":
-            return ChoiceValidator(config)
-        case "multiple-choice":
-            return MultipleChoiceValidator(config)
-        case "warnings":
-            return WarningsValidator(config)
-        case "custom":
-            return CustomValidator(config)
-        case _:
-            return None
+    validator_class = _VALIDATOR_TYPES.get(config.get("type", "file"))
+    return validator_class(config) if validator_class is not None else None
 
 
 class CommandLineCompleter(Completer):
@@ -58,6 +140,12 @@ class CommandLineCompleter(Completer):
         self.config = config
         self.matcher = matcher
         self._default_validator = self._create_default_validator()
+        # Validators by id() of their flag's config dict; the dict is kept
+        # alongside so a reused id can never return the wrong validator
+        self._validator_cache: dict[int, tuple[dict[str, Any], Validator | None]] = {}
+        # Working directory and when it was looked up (see _get_cwd)
+        self._cwd = ""
+        self._cwd_time = 0.0
 
     def _create_default_validator(self) -> Validator | None:
         """Create the default validator from config."""
@@ -137,24 +225,35 @@ class CommandLineCompleter(Completer):
         Returns:
             Tuple of (token, index) or (None, -1) if cursor is after all tokens
         """
-        for i, token in enumerate(tokens):
-            # Cursor is within this token
-            if token.start <= cursor_pos <= token.end:
-                return token, i
-
-            # Cursor is between this token and the next
-            if token.end < cursor_pos:
-                if i + 1 < len(tokens) and tokens[i + 1].start > cursor_pos:
-                    # In whitespace between tokens - return None to trigger default
-                    return None, -1
-
-        # Cursor is after all tokens
+        # Tokens are in text order: find the last one starting at or before
+        # the cursor, or the one before it if both touch the cursor
+        i = bisect_right(tokens, cursor_pos, key=_token_start) - 1
+        if i > 0 and tokens[i - 1].end >= cursor_pos:
+            i -= 1
+
+        if i >= 0 and tokens[i].end >= cursor_pos:
+            return tokens[i], i
+
+        # Cursor is in whitespace between tokens or after all of them
         return None, -1
 
+    def _get_cwd(self) -> str:
+        """Get the working directory, looking it up at most every _CWD_TTL seconds."""
+        now = time.monotonic()
+        if not self._cwd or now - self._cwd_time > _CWD_TTL:
+            self._cwd = os.getcwd()
+            self._cwd_time = now
+        return self._cwd
+
     def _get_validator_for_result(self, result: MatchResult) -> Validator | None:
         """Get the validator for a match result."""
         if result.flag and result.flag.validator:
-            return create_validator(result.flag.validator)
+            validator_config = result.flag.validator
+            cached = self._validator_cache.get(id(validator_config))
+            if cached is None or cached[0] is not validator_config:
+                cached = (validator_config, create_validator(validator_config))
+                self._validator_cache[id(validator_config)] = cached
+            return cached[1]
         return None
 
     def _get_completion_context(
@@ -199,7 +298,7 @@ class CommandLineCompleter(Completer):
         if validator is None:
             return
 
-        context = {"cwd": os.getcwd()}
+        context = {"cwd": self._get_cwd()}
         result = validator.get_completions(partial, context)
 
         for completion in result.completions:
@@ -224,7 +323,7 @@ class CommandLineCompleter(Completer):
 
         Uses two-tier approach:
         1. Known programs from config and built-in list
-        2. Fallback to PATH scanning
+        2. Fallback to PATH executables
 
         Args:
             partial: Partial executable name
@@ -236,13 +335,14 @@ class CommandLineCompleter(Completer):
         from prompt_cli.core.programs import get_program_names
 
         seen: set[str] = set()
+        prefix = partial.lower()
 
         # Tier 1: Known programs (fast)
         for name in get_program_names(self.config):
             if name in seen:
                 continue
 
-            if partial and not name.lower().startswith(partial.lower()):
+            if prefix and not name.lower().startswith(prefix):
                 continue
 
             seen.add(name)
@@ -252,32 +352,20 @@ class CommandLineCompleter(Completer):
                 display=name,
             )
 
-        # Tier 2: PATH executables (slower, but catches everything else)
-        path_dirs = os.environ.get("PATH", "").split(os.pathsep)
+        # Tier 2: PATH executables (cached per directory, see _path_executables)
+        lowered, names = _path_executables(os.environ.get("PATH", ""))
 
-        for path_dir in path_dirs:
-            if not os.path.isdir(path_dir):
-                continue
+        for i in range(bisect_left(lowered, prefix), len(lowered)):
+            if not lowered[i].startswith(prefix):
+                break
 
-            try:
-                for entry in os.scandir(path_dir):
-                    if not entry.is_file():
-                        continue
-
-                    name = entry.name
-                    if name in seen:
-                        continue
-
-                    if partial and not name.lower().startswith(partial.lower()):
-                        continue
-
-                    # Check if executable
-                    if os.access(entry.path, os.X_OK):
-                        seen.add(name)
-                        yield Completion(
-                            text=name,
-                            start_position=-len(partial),
-                            display=name,
-                        )
-            except OSError:
+            name = names[i]
+            if name in seen:
                 continue
+
+            seen.add(name)
+            yield Completion(
+                text=name,
+                start_position=-len(partial),
+                display=name,
+            )
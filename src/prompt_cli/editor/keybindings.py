@@ -108,6 +108,8 @@ KEY_MAPPING: dict[str, str | Keys] = {
     "f12": Keys.F12,
 }
 
+_CTRL_SHIFT_PREFIX = "ctrl-shift-"
+
 
 def parse_key_spec(key_spec: str) -> str | Keys | tuple[str | Keys, ...]:
     """Parse a key specification string to prompt_toolkit key.
@@ -118,15 +120,17 @@ def parse_key_spec(key_spec: str) -> str | Keys | tuple[str | Keys, ...]:
     Returns:
         prompt_toolkit key specification
     """
-    key_lower = key_spec.lower()
+    # Config keys are normally lowercase already, so skip lowering those
+    key_lower = key_spec if key_spec.islower() else key_spec.lower()
 
     # Check direct mapping
-    if key_lower in KEY_MAPPING:
-        return KEY_MAPPING[key_lower]
+    key = KEY_MAPPING.get(key_lower)
+    if key is not None:
+        return key
 
     # Handle ctrl-shift combinations
-    if key_lower.startswith("ctrl-shift-"):
-        char = key_lower[11:]
+    if key_lower.startswith(_CTRL_SHIFT_PREFIX):
+        char = key_lower[len(_CTRL_SHIFT_PREFIX) :]
         if len(char) == 1:
             # ctrl-shift-x is often the same as ctrl-X (uppercase)
             return getattr(Keys, f"Control{char.upper()}", key_spec)
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from itertools import pairwise
+from operator import attrgetter
 from typing import TYPE_CHECKING
 
 from prompt_toolkit.document import Document
@@ -10,13 +13,18 @@ from prompt_toolkit.formatted_text import StyleAndTextTuples
 from prompt_toolkit.lexers import Lexer
 
 from prompt_cli.core.color import ColorParser, get_colors_for_groups
-from prompt_cli.core.matcher import Matcher, MatchResult
+from prompt_cli.core.matcher import CaptureGroup, Matcher, MatchResult
 from prompt_cli.core.tokenizer import tokenize
 
 if TYPE_CHECKING:
     from prompt_cli.config.schema import Config, Theme
     from prompt_cli.editor.prompt import CommandLineEditor
 
+_group_start = attrgetter("start")
+
+# Matchers kept for the most recently typed executables
+_MAX_MATCHERS = 8
+
 
 class CommandLineLexer(Lexer):
     """Lexer for command line syntax highlighting based on configuration."""
@@ -41,22 +49,33 @@ class CommandLineLexer(Lexer):
         self.executable = executable
         self.editor = editor
         self.matcher = Matcher(config, executable)
+        # Matchers by first token (least recently used first), when the
+        # executable comes from the text
+        self._matchers: OrderedDict[str, Matcher] = OrderedDict()
         self.color_parser = ColorParser()
 
         # Lights-off mode state
         self.lights_off = False
         self.lights_off_category: str | None = None
 
+        # Style class by category name, filled by _build_styles and _style_class
+        self._style_classes: dict[str, str] = {}
+
         # Build style dict for prompt_toolkit
         self._styles = self._build_styles()
 
+        # Last lexed state and its line function; redraws that only move the
+        # cursor lex the same text again
+        self._lex_cache: tuple[tuple[object, ...], Callable[[int], StyleAndTextTuples]] | None
+        self._lex_cache = None
+
     def _build_styles(self) -> dict[str, str]:
         """Build prompt_toolkit style dictionary from theme."""
         styles: dict[str, str] = {}
 
         # Add category styles
         for category_name, color_spec in self.theme.categories.items():
-            style_class = self._category_to_class(category_name)
+            style_class = self._style_class(category_name)
             parsed = self.color_parser.parse(color_spec)
             styles[style_class] = parsed.to_prompt_toolkit_style()
 
@@ -105,6 +124,13 @@ class CommandLineLexer(Lexer):
         class_name = category.lower().replace(":", "-").replace(" ", "-")
         return f"class:{class_name}"
 
+    def _style_class(self, category: str) -> str:
+        """Get the style class for a category, converting each name only once."""
+        style_class = self._style_classes.get(category)
+        if style_class is None:
+            style_class = self._style_classes[category] = self._category_to_class(category)
+        return style_class
+
     def get_style_dict(self) -> dict[str, str]:
         """Get the style dictionary for prompt_toolkit."""
         return self._styles
@@ -118,13 +144,37 @@ class CommandLineLexer(Lexer):
         Returns:
             Function that takes a line number and returns styled text tuples
         """
-        # Tokenize and match the entire document
         text = document.text
+
+        # Styling depends on the text and on the lights-off and duplicates
+        # mode state, so all of them make up the cache key
+        dup_mode = self.editor.duplicates_mode if self.editor else None
+        dup_state = None
+        if dup_mode:
+            dup_state = (
+                frozenset(dup_mode.get_highlighted_indices()),
+                dup_mode.get_current_index(),
+                frozenset(dup_mode.get_selected_indices()),
+            )
+        key = (text, self.lights_off, self.lights_off_category, dup_state)
+        if self._lex_cache is not None and self._lex_cache[0] == key:
+            return self._lex_cache[1]
+
+        # Tokenize and match the entire document
         tokens = tokenize(text)
 
         # Set executable from first token if not set
         if not self.executable and tokens:
-            self.matcher = Matcher(self.config, tokens[0].value)
+            executable = tokens[0].value
+            if self.matcher.executable != executable:
+                matcher = self._matchers.get(executable)
+                if matcher is None:
+                    matcher = self._matchers[executable] = Matcher(self.config, executable)
+                    if len(self._matchers) > _MAX_MATCHERS:
+                        self._matchers.popitem(last=False)
+                else:
+                    self._matchers.move_to_end(executable)
+                self.matcher = matcher
 
         # Match all tokens
         results = self.matcher.match_tokens(tokens)
@@ -139,6 +189,7 @@ class CommandLineLexer(Lexer):
                 return styled_tokens
             return []
 
+        self._lex_cache = (key, get_line)
         return get_line
 
     def _style_results(
@@ -146,6 +197,7 @@ class CommandLineLexer(Lexer):
     ) -> StyleAndTextTuples:
         """Convert match results to styled text tuples."""
         styled: StyleAndTextTuples = []
+        append = styled.append
         last_end = 0
 
         # Get duplicates mode state if available
@@ -159,13 +211,15 @@ class CommandLineLexer(Lexer):
             dup_current = dup_mode.get_current_index()
             dup_selected = dup_mode.get_selected_indices()
 
+        lights_off_category = self.lights_off_category.lower() if self.lights_off_category else None
+
         for i, result in enumerate(results):
             token = result.token
 
             # Add any whitespace before this token
             if token.start > last_end:
                 whitespace = original_text[last_end : token.start]
-                styled.append(("", whitespace))
+                append(("", whitespace))
 
             # Get style for this token's category
             category = result.category
@@ -174,34 +228,34 @@ class CommandLineLexer(Lexer):
             if dup_mode and i in dup_indices:
                 if i == dup_current:
                     # Current duplicate - highlight prominently
-                    styled.append(("class:duplicate-current", token.raw))
+                    append(("class:duplicate-current", token.raw))
                 elif i in dup_selected:
                     # Selected duplicate group
-                    styled.append(("class:duplicate-selected", token.raw))
+                    append(("class:duplicate-selected", token.raw))
                 else:
                     # Other duplicate
-                    styled.append(("class:duplicate", token.raw))
+                    append(("class:duplicate", token.raw))
                 last_end = token.end
                 continue
             elif dup_mode:
                 # In duplicates mode but not a duplicate - dim it
-                styled.append(("class:duplicate-dim", token.raw))
+                append(("class:duplicate-dim", token.raw))
                 last_end = token.end
                 continue
 
             # Check lights-off mode
             if self.lights_off:
-                if self.lights_off_category:
+                if lights_off_category:
                     # Only highlight matching category, dim everything else
-                    if category.lower() != self.lights_off_category.lower():
-                        styled.append(("class:lights-off-dim", token.raw))
+                    if category.lower() != lights_off_category:
+                        append(("class:lights-off-dim", token.raw))
                         last_end = token.end
                         continue
                     # Matching category gets extra highlight
                     # (fall through to normal styling with potential highlight)
                 else:
                     # No category specified - dim everything
-                    styled.append(("class:lights-off-dim", token.raw))
+                    append(("class:lights-off-dim", token.raw))
                     last_end = token.end
                     continue
 
@@ -216,57 +270,56 @@ class CommandLineLexer(Lexer):
 
                 colors = get_colors_for_groups(cat_colors, len(result.groups))
 
-                # Build styled text for each group
-                token_styled = self._style_groups(token.value, result.groups, colors, category)
-                styled.extend(token_styled)
+                # Add styled text for each group
+                self._style_groups(styled, token.value, result.groups, colors, category)
             else:
                 # No groups, style entire token
-                style_class = self._category_to_class(category)
-                styled.append((style_class, token.raw))
+                style_class = self._style_class(category)
+                append((style_class, token.raw))
 
             last_end = token.end
 
         # Add any trailing text
         if last_end < len(original_text):
-            styled.append(("", original_text[last_end:]))
+            append(("", original_text[last_end:]))
 
         return styled
 
     def _style_groups(
         self,
+        styled: StyleAndTextTuples,
         token_value: str,
-        groups: list,
+        groups: Sequence[CaptureGroup],
         colors: list,
         category: str,
-    ) -> StyleAndTextTuples:
-        """Style a token based on capture groups."""
-        styled: StyleAndTextTuples = []
+    ) -> None:
+        """Style a token based on capture groups, appending to styled."""
+        append = styled.append
+        style_class = self._style_class(category)
 
-        # Sort groups by start position
-        sorted_groups = sorted(groups, key=lambda g: g.start)
+        # Groups come in group number order, which is start order unless a
+        # repeated alternation left a later group earlier in the token
+        if any(a.start > b.start for a, b in pairwise(groups)):
+            groups = sorted(groups, key=_group_start)
 
         last_pos = 0
-        for i, group in enumerate(sorted_groups):
+        for i, group in enumerate(groups):
             # Add any text before this group
             if group.start > last_pos:
                 prefix = token_value[last_pos : group.start]
-                style_class = self._category_to_class(category)
-                styled.append((style_class, prefix))
+                append((style_class, prefix))
 
             # Style the group
             color = colors[min(i, len(colors) - 1)]
             style_str = color.to_prompt_toolkit_style()
-            styled.append((style_str, group.value))
+            append((style_str, group.value))
 
             last_pos = group.end
 
         # Add any text after the last group
         if last_pos < len(token_value):
             suffix = token_value[last_pos:]
-            style_class = self._category_to_class(category)
-            styled.append((style_class, suffix))
-
-        return styled
+            append((style_class, suffix))
 
     def set_lights_off(self, enabled: bool, category: str | None = None) -> None:
         """Set lights-off mode.
@@ -30,7 +30,7 @@ class CustomValidator(Validator):
         if not self.command:
             return ValidatorResult(completions=[])
 
-        cwd = context.get("cwd", os.getcwd())
+        cwd = context.get("cwd") or os.getcwd()
 
         # Build environment with context
         env = os.environ.copy()
@@ -26,7 +26,7 @@ class FileValidator(Validator):
 
     def get_completions(self, current_value: str, context: dict[str, Any]) -> ValidatorResult:
         """Get file completions."""
-        cwd = context.get("cwd", os.getcwd())
+        cwd = context.get("cwd") or os.getcwd()
 
         # Handle multiple values
         if self.multiple and self.separator in current_value:
@@ -133,7 +133,7 @@ class FileValidator(Validator):
 
     def validate(self, value: str, context: dict[str, Any]) -> ValidatorResult:
         """Validate file path."""
-        cwd = context.get("cwd", os.getcwd())
+        cwd = context.get("cwd") or os.getcwd()
 
         # Handle multiple values
         if self.multiple:
@@ -185,7 +185,7 @@ class DirectoryValidator(FileValidator):
 
     def validate(self, value: str, context: dict[str, Any]) -> ValidatorResult:
         """Validate directory path."""
-        cwd = context.get("cwd", os.getcwd())
+        cwd = context.get("cwd") or os.getcwd()
 
         path = Path(value)
         if not path.is_absolute():
@@ -2,10 +2,19 @@
 
 import pytest
 
+from prompt_cli.config import loader
 from prompt_cli.config.loader import load_config_from_string
 from prompt_cli.config.schema import Config
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep the parsed-config cache out of the user's home directory."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(loader, "DEFAULT_CACHE_DIR", cache_dir)
+    return cache_dir
+
+
 @pytest.fixture
 def sample_config() -> Config:
     """Sample configuration for testing."""
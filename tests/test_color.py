@@ -0,0 +1,132 @@
+"""Tests for the color module."""
+
+import dataclasses
+
+import pytest
+
+from prompt_cli.core.color import ColorParser, ParsedColor, combine_colors, parse_color
+
+
+class TestToAnsi:
+    """Tests for ParsedColor.to_ansi."""
+
+    @pytest.mark.parametrize(
+        ("spec", "expected"),
+        [
+            ("red", "\033[0;31m"),
+            ("on blue", "\033[0;44m"),
+            ("bold red on white", "\033[0;1;31;47m"),
+            (
+                "dim italic underline blink reverse hidden strikethrough green",
+                "\033[0;2;3;4;5;7;8;9;32m",
+            ),
+            ("inverse underline", "\033[0;4;7m"),
+            ("+bold", "\033[1m"),
+            ("", "\033[0m"),
+        ],
+    )
+    def test_to_ansi(self, spec, expected):
+        """Test escape sequences for colors and attributes."""
+        assert ColorParser().parse(spec).to_ansi() == expected
+
+    def test_combining_without_codes_is_empty(self):
+        """Test that a combining color with nothing set emits nothing."""
+        assert ParsedColor(combine=True).to_ansi() == ""
+
+    def test_numbered_colors(self):
+        """Test numbered foreground and background colors 0-7."""
+        assert ParsedColor(fg=3, bg=4).to_ansi() == "\033[0;33;44m"
+
+    @pytest.mark.parametrize(
+        ("spec", "expected"),
+        [
+            ("bright red", "\033[0;91m"),
+            ("bright black on bright white", "\033[0;90;107m"),
+            ("gray", "\033[0;90m"),
+            ("bright yellow bold", "\033[0;1;93m"),
+        ],
+    )
+    def test_bright_colors(self, spec, expected):
+        """Test bright colors use the 90-97 and 100-107 code ranges."""
+        assert ColorParser().parse(spec).to_ansi() == expected
+
+    def test_numbered_bright_colors(self):
+        """Test numbered colors 8-15 map to bright codes."""
+        assert ParsedColor(fg=9, bg=12).to_ansi() == "\033[0;91;104m"
+
+    @pytest.mark.parametrize(
+        "color",
+        ["196", "#ff8800", 196],
+    )
+    def test_256_and_rgb_colors_have_no_code(self, color):
+        """Test 256-color and RGB colors emit no SGR code (not supported yet)."""
+        assert ParsedColor(fg=color).to_ansi() == "\033[0m"
+        assert ParsedColor(fg="red", bg=color).to_ansi() == "\033[0;31m"
+
+
+class TestToPromptToolkitStyle:
+    """Tests for ParsedColor.to_prompt_toolkit_style."""
+
+    @pytest.mark.parametrize(
+        ("spec", "expected"),
+        [
+            ("red", "ansired"),
+            ("on blue", "bg:ansiblue"),
+            ("bold red on white", "bold ansired bg:ansiwhite"),
+            (
+                "dim italic underline blink reverse hidden strikethrough green",
+                "italic underline blink reverse hidden strike ansigreen",
+            ),
+            ("", ""),
+        ],
+    )
+    def test_to_prompt_toolkit_style(self, spec, expected):
+        """Test style strings for colors and attributes (dim is not supported)."""
+        assert ColorParser().parse(spec).to_prompt_toolkit_style() == expected
+
+    def test_numbered_colors(self):
+        """Test numbered colors map to ANSI names."""
+        assert ParsedColor(fg=3, bg=4).to_prompt_toolkit_style() == "ansiyellow bg:ansiblue"
+
+    def test_bright_colors(self):
+        """Test bright colors map to ansibright names."""
+        style = ColorParser().parse("bright black on bright white").to_prompt_toolkit_style()
+        assert style == "ansibrightblack bg:ansibrightwhite"
+        assert ParsedColor(fg=9, bg=12).to_prompt_toolkit_style() == (
+            "ansibrightred bg:ansibrightblue"
+        )
+
+    def test_256_and_rgb_colors(self):
+        """Test 256-color numbers become grays and color strings pass through."""
+        assert ParsedColor(fg=196, bg=21).to_prompt_toolkit_style() == "#c4c4c4 bg:#151515"
+        assert ColorParser().parse("#ff8800").to_prompt_toolkit_style() == "#ff8800"
+        assert ColorParser().parse("red on 21").to_prompt_toolkit_style() == "ansired bg:21"
+
+
+class TestParseCaching:
+    """Tests for parsed colors shared through the parse cache."""
+
+    def test_same_spec_returns_equal_colors(self):
+        """Test that parsing a spec twice gives equal results."""
+        first = ColorParser().parse("bold red on white")
+        second = parse_color("bold red on white")
+
+        assert first == second
+        assert first.to_ansi() == second.to_ansi() == "\033[0;1;31;47m"
+
+    def test_parsed_colors_are_immutable(self):
+        """Test that one caller cannot change the color another caller gets."""
+        first = parse_color("bold red")
+        second = parse_color("bold red")
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            first.fg = "blue"
+
+        changed = dataclasses.replace(first, fg="blue")
+        combined = combine_colors(first, parse_color("+underline"))
+
+        assert changed.to_ansi() == "\033[0;1;34m"
+        assert combined.underline is True
+        assert second.fg == "red"
+        assert second.underline is None
+        assert second.to_ansi() == "\033[0;1;31m"
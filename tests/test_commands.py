@@ -33,6 +33,13 @@ class TestParseCommandString:
         assert name == "lights-off"
         assert args == ["my category"]
 
+    def test_unterminated_quote(self):
+        """Test that an unterminated quote runs to the end."""
+        name, args = parse_command_string("lights-off 'my category")
+
+        assert name == "lights-off"
+        assert args == ["my category"]
+
     def test_empty_string(self):
         """Test parsing empty string."""
         name, args = parse_command_string("")
@@ -89,6 +96,40 @@ class TestCommandRegistry:
         with pytest.raises(ValueError, match="Ambiguous"):
             registry.get("c-f")
 
+    def test_reregister_replaces_command(self):
+        """Test registering a name again replaces its function without duplicating it."""
+        registry = CommandRegistry()
+
+        @registry.register("copy-file")
+        def old_copy_file(editor, args):
+            pass
+
+        @registry.register("copy-file")
+        def new_copy_file(editor, args):
+            pass
+
+        assert registry.get("copy-file") is new_copy_file
+        assert registry.get("c-f") is new_copy_file
+        assert registry._match_abbreviation("c-f") == ["copy-file"]
+
+    def test_ambiguous_matches_in_registration_order(self):
+        """Test ambiguous matches are listed in registration order."""
+        registry = CommandRegistry()
+
+        for name in ["cut-line", "copy-line", "cut", "copy-file", "clear"]:
+            registry.register(name)(lambda editor, args: None)
+
+        assert registry._match_abbreviation("c") == [
+            "cut-line",
+            "copy-line",
+            "cut",
+            "copy-file",
+            "clear",
+        ]
+        assert registry._match_abbreviation("c-l") == ["cut-line", "copy-line"]
+        with pytest.raises(ValueError, match=r"\['cut-line', 'copy-line'\]"):
+            registry.get("c-l")
+
     def test_list_commands(self):
         """Test listing registered commands."""
         registry = CommandRegistry()
@@ -136,3 +177,54 @@ class TestBuiltinCommands:
         assert commands.get("duplicate-next") is not None
         assert commands.get("duplicates-keep") is not None
         assert commands.get("duplicates-exit") is not None
+
+
+class TestWordCommands:
+    """Tests for word movement and deletion commands."""
+
+    def _editor(self, text: str, cursor: int):
+        """Create a minimal editor holding a buffer."""
+        from types import SimpleNamespace
+
+        from prompt_toolkit.buffer import Buffer
+        from prompt_toolkit.document import Document
+
+        return SimpleNamespace(buffer=Buffer(document=Document(text, cursor)))
+
+    @pytest.mark.parametrize(
+        ("cursor", "expected"),
+        [(0, 4), (1, 4), (3, 4), (4, 9), (9, 11), (11, 11)],
+    )
+    def test_move_word_right(self, cursor, expected):
+        """Test moving past the current word and following whitespace."""
+        editor = self._editor("gcc -O2 \t-c", cursor)
+        commands.execute("move-word-right", editor)
+
+        assert editor.buffer.cursor_position == expected
+
+    @pytest.mark.parametrize(
+        ("cursor", "expected"),
+        [(0, 0), (3, 0), (4, 0), (6, 4), (9, 4), (11, 9)],
+    )
+    def test_move_word_left(self, cursor, expected):
+        """Test moving back over whitespace and the previous word."""
+        editor = self._editor("gcc -O2 \t-c", cursor)
+        commands.execute("move-word-left", editor)
+
+        assert editor.buffer.cursor_position == expected
+
+    def test_delete_word_right(self):
+        """Test deleting the rest of the word and following whitespace."""
+        editor = self._editor("gcc -O2  -c", 5)
+        commands.execute("delete-word-right", editor)
+
+        assert editor.buffer.text == "gcc --c"
+        assert editor.buffer.cursor_position == 5
+
+    def test_delete_word_left(self):
+        """Test deleting whitespace and the word before the cursor."""
+        editor = self._editor("gcc -O2  -c", 9)
+        commands.execute("delete-word-left", editor)
+
+        assert editor.buffer.text == "gcc -c"
+        assert editor.buffer.cursor_position == 4
@@ -37,6 +37,10 @@ class TestCreateValidator:
         assert validator is not None
         assert validator.options == ["a", "b", "c"]
 
+    def test_create_unknown_validator(self):
+        """Test an unknown validator type creates nothing."""
+        assert create_validator({"type": "unknown"}) is None
+
     def test_create_none_validator(self):
         """Test creating validator from None."""
         validator = create_validator(None)
@@ -110,6 +114,29 @@ flags:
         completion_texts = [c.text for c in completions]
         assert "0" in completion_texts or len(completions) >= 0
 
+    def test_flag_validator_reused(self):
+        """Test the validator for a flag is created once and reused."""
+        from prompt_cli.config.loader import load_config_from_string
+        from prompt_cli.core.tokenizer import Token
+
+        config = load_config_from_string('''
+flags:
+  - category: Optimization
+    regexps:
+      - "-(O)(.*)"
+    validator:
+      type: choice
+      options: ["0", "1", "2"]
+''')
+        matcher = Matcher(config, "gcc")
+        completer = CommandLineCompleter(config, matcher)
+
+        first = completer._get_validator_for_result(matcher.match_token(Token("-O", 0, 2)))
+        second = completer._get_validator_for_result(matcher.match_token(Token("-O2", 0, 3)))
+
+        assert first is not None
+        assert first is second
+
     def test_find_token_at_cursor(self, sample_config):
         """Test finding token at cursor position."""
         matcher = Matcher(sample_config)
@@ -131,7 +158,68 @@ flags:
         assert token.value == "-I/tmp"
         assert idx == 1
 
+        # Cursor at the end of "-I/tmp"
+        token, idx = completer._find_token_at_cursor(tokens, 10)
+        assert token is not None
+        assert token.value == "-I/tmp"
+
+        # Cursor in whitespace between tokens
+        tokens = tokenize("gcc  -c")
+        token, idx = completer._find_token_at_cursor(tokens, 4)
+        assert token is None
+        assert idx == -1
+
         # Cursor after all tokens
         token, idx = completer._find_token_at_cursor(tokens, 100)
         assert token is None
         assert idx == -1
+
+
+class TestPathExecutables:
+    """Tests for PATH executable completion."""
+
+    @staticmethod
+    def _make_executable(path: Path) -> None:
+        path.write_text("#!/bin/sh\n")
+        path.chmod(0o755)
+
+    def test_complete_path_executables(self, sample_config, tmp_path, monkeypatch):
+        """Test PATH executables are completed by case-insensitive prefix."""
+        self._make_executable(tmp_path / "zzqTool")
+        self._make_executable(tmp_path / "zzqother")
+        (tmp_path / "zzqdata").write_text("")
+        monkeypatch.setenv("PATH", str(tmp_path))
+
+        completer = CommandLineCompleter(sample_config, Matcher(sample_config))
+        completions = list(completer._complete_executables("ZZQT", 0))
+
+        assert [c.text for c in completions] == ["zzqTool"]
+
+    def test_path_directory_rescanned_on_change(self, sample_config, tmp_path, monkeypatch):
+        """Test a changed PATH directory is scanned again."""
+        self._make_executable(tmp_path / "zzqfirst")
+        monkeypatch.setenv("PATH", str(tmp_path))
+
+        completer = CommandLineCompleter(sample_config, Matcher(sample_config))
+        assert [c.text for c in completer._complete_executables("zzq", 0)] == ["zzqfirst"]
+
+        self._make_executable(tmp_path / "zzqsecond")
+        mtime_ns = tmp_path.stat().st_mtime_ns + 1_000_000_000
+        os.utime(tmp_path, ns=(mtime_ns, mtime_ns))
+
+        completions = [c.text for c in completer._complete_executables("zzq", 0)]
+        assert completions == ["zzqfirst", "zzqsecond"]
+
+    def test_path_executables_follow_symlinks(self, sample_config, tmp_path, monkeypatch):
+        """Test symlinked executables are completed and broken links skipped."""
+        target = tmp_path / "real"
+        target.mkdir()
+        self._make_executable(target / "zzqreal")
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        (bin_dir / "zzqlink").symlink_to(target / "zzqreal")
+        (bin_dir / "zzqbroken").symlink_to(target / "missing")
+        monkeypatch.setenv("PATH", str(bin_dir))
+
+        completer = CommandLineCompleter(sample_config, Matcher(sample_config))
+        assert [c.text for c in completer._complete_executables("zzq", 0)] == ["zzqlink"]
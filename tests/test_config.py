@@ -1,15 +1,25 @@
 """Tests for the config module."""
 
+import os
+import sys
 import tempfile
 from pathlib import Path
 
+import pytest
+import yaml
+from pydantic import ValidationError
+
 from prompt_cli.config.loader import (
+    _intern_strings,
     deep_merge,
     load_config,
     load_config_from_string,
+    load_dropin_directory,
+    load_yaml_file,
 )
 from prompt_cli.config.schema import (
     Config,
+    Flag,
     parse_validator,
 )
 
@@ -44,6 +54,43 @@ class TestDeepMerge:
 
         assert result == {"items": [1, 2, 3, 4]}
 
+    def test_merge_deeply_nested_dicts(self):
+        """Test merging dicts nested deeper than the recursion limit."""
+        base: dict = {}
+        override: dict = {}
+        base_leaf, override_leaf = base, override
+        for _ in range(5000):
+            base_leaf = base_leaf.setdefault("k", {})
+            override_leaf = override_leaf.setdefault("k", {})
+        base_leaf["a"] = 1
+        override_leaf["b"] = 2
+
+        result = deep_merge(base, override)
+
+        leaf = result
+        for _ in range(5000):
+            leaf = leaf["k"]
+        assert leaf == {"a": 1, "b": 2}
+
+    def test_merge_does_not_mutate_base(self):
+        """Test that the default merge leaves base untouched."""
+        base = {"a": {"x": 1}, "items": [1]}
+        override = {"a": {"y": 2}, "items": [2]}
+
+        deep_merge(base, override)
+
+        assert base == {"a": {"x": 1}, "items": [1]}
+
+    def test_merge_inplace(self):
+        """Test merging into base in place."""
+        base = {"a": {"x": 1}, "items": [1]}
+        override = {"a": {"y": 2}, "items": [2], "b": 3}
+
+        result = deep_merge(base, override, inplace=True)
+
+        assert result is base
+        assert base == {"a": {"x": 1, "y": 2}, "items": [1, 2], "b": 3}
+
 
 class TestLoadConfigFromString:
     """Tests for load_config_from_string function."""
@@ -165,6 +212,117 @@ class TestConfig:
 
         assert program is None
 
+    def test_get_program_literal_only_config(self):
+        """Test lookup in a config without glob/regexp aliases."""
+        config = load_config_from_string("""
+programs:
+  clang:
+    aliases: [Clang++]
+""")
+
+        assert config.get_program("/usr/bin/clang++").name == "clang"
+        assert config.get_program("CLANG").name == "clang"
+        assert config.get_program("gcc") is None
+
+    def test_get_program_regexp_alias(self):
+        """Test lookup through a regexp alias (prefix match)."""
+        config = load_config_from_string("""
+programs:
+  python:
+    aliases: ["regexp:python[0-9.]*", "regexp:(broken"]
+""")
+
+        assert config.get_program("python3.12").name == "python"
+        assert config.get_program("jython") is None
+
+    def test_get_program_regexp_alias_with_groups(self):
+        """Test that regexp aliases keep their own group numbering."""
+        config = load_config_from_string("""
+programs:
+  twice:
+    aliases: ["regexp:(ab)\\\\1$"]
+""")
+
+        assert config.get_program("abab").name == "twice"
+        assert config.get_program("abcd") is None
+
+    def test_get_program_mixed_fusable_aliases(self):
+        """Test ordering across fused and standalone regexp aliases."""
+        config = load_config_from_string("""
+programs:
+  first:
+    aliases: ["glob:x-*"]
+  second:
+    aliases: ["regexp:(?i)X-CC", "regexp:(y)\\\\1"]
+  third:
+    aliases: ["glob:*-cc", "yy-tool"]
+""")
+
+        assert config.get_program("x-cc").name == "first"
+        assert config.get_program("X-CC").name == "second"
+        assert config.get_program("yy").name == "second"
+        assert config.get_program("z-cc").name == "third"
+        assert config.get_program("YY-TOOL").name == "third"
+
+    def test_get_program_inline_flag_aliases(self):
+        """Test aliases with global inline flags are not fused with others."""
+        config = load_config_from_string("""
+programs:
+  first:
+    aliases: ["glob:x-*", "regexp:(?u)uni-cc"]
+  second:
+    aliases: ["regexp:(?i)Y-CC", "regexp:z-cc"]
+""")
+
+        assert config.get_program("x-cc").name == "first"
+        assert config.get_program("uni-cc").name == "first"
+        assert config.get_program("y-cc").name == "second"
+        assert config.get_program("z-cc").name == "second"
+        assert config.get_program("y-cc", ignore_case=True).name == "second"
+        assert config.get_program("Z-CC", ignore_case=True).name == "second"
+
+    def test_get_program_combined_aliases(self):
+        """Test several pattern aliases of one program sharing a single group."""
+        config = load_config_from_string("""
+programs:
+  gcc:
+    aliases: ["glob:*-gcc", "cc", "regexp:gcc-[0-9]+"]
+  clang:
+    aliases: ["glob:*-clang", "regexp:clang-[0-9]+"]
+""")
+
+        assert config.get_program("arm-gcc").name == "gcc"
+        assert config.get_program("CC").name == "gcc"
+        assert config.get_program("gcc-12").name == "gcc"
+        assert config.get_program("x-clang").name == "clang"
+        assert config.get_program("clang-17").name == "clang"
+        assert config.get_program("gcc-x") is None
+
+    def test_get_program_first_program_wins(self):
+        """Test that programs are tried in config order."""
+        config = load_config_from_string("""
+programs:
+  cross:
+    aliases: ["glob:*gcc"]
+  gcc: {}
+""")
+
+        assert config.get_program("gcc").name == "cross"
+
+    def test_get_program_name_before_later_pattern(self):
+        """Test that a name wins over patterns of later programs."""
+        config = load_config_from_string("""
+programs:
+  gcc:
+    aliases: ["glob:gcc-*"]
+  cross:
+    aliases: ["glob:*gcc*"]
+""")
+
+        assert config.get_program("GCC").name == "gcc"
+        assert config.get_program("gcc-12").name == "gcc"
+        assert config.get_program("xgcc").name == "cross"
+
     def test_get_flags_for_program(self, sample_config):
         """Test getting flags for a program."""
         flags = sample_config.get_flags_for_program("gcc")
@@ -175,6 +333,40 @@ class TestConfig:
         assert "Libraries" in categories
         assert "Architecture" in categories
 
+    def test_get_flags_for_program_cached(self, sample_config):
+        """Test that flags are built once per program."""
+        flags = sample_config.get_flags_for_program("gcc")
+
+        assert isinstance(flags, tuple)
+        assert sample_config.get_flags_for_program("/usr/bin/gcc") is flags
+        assert sample_config.get_flags_for_program("unknown") == tuple(sample_config.flags)
+
+    def test_flag_compiled_regexps(self, sample_config):
+        """Test that flag regexps are compiled once and anchored."""
+        flag = sample_config.flags[1]
+
+        compiled = flag.compiled_regexps
+
+        assert compiled is flag.compiled_regexps
+        assert [p.pattern for p in compiled] == ["^-(L)(.*)$", "^-(l)(.+)$"]
+
+    def test_flag_compiled_regexps_keep_existing_anchors(self):
+        """Test that patterns with their own anchors are not anchored twice."""
+        flag = Flag(category="Test", regexps=["^-a$", "-b$", "-c\\$", "^-d"])
+
+        assert [p.pattern for p in flag.compiled_regexps] == ["^-a$", "^-b$", "^-c\\$$", "^-d$"]
+
+    def test_flag_compiled_regexps_skips_invalid(self):
+        """Test that invalid regexps are skipped when compiling."""
+        flag = Flag(category="Broken", regexps=["-(unclosed", "-(ok)"])
+
+        assert [p.pattern for p in flag.compiled_regexps] == ["^-(ok)$"]
+
+    def test_config_is_frozen(self, sample_config):
+        """Test that loaded config models reject attribute assignment."""
+        with pytest.raises(ValidationError):
+            sample_config.config.color = False
+
     def test_get_theme_default(self, sample_config):
         """Test getting default theme."""
         theme = sample_config.get_theme()
@@ -209,6 +401,26 @@ class TestParseValidator:
         assert validator.type == "choice"
         assert validator.options == ["a", "b", "c"]
 
+    def test_parse_directory_validator(self):
+        """Test that directory configs parse as file validators."""
+        validator = parse_validator({"type": "directory"})
+
+        assert validator is not None
+        assert validator.type == "directory"
+        assert validator.change is True
+
+    def test_parse_validator_defaults_to_file(self):
+        """Test that a config without a type parses as a file validator."""
+        validator = parse_validator({"extensions": [".c"]})
+
+        assert validator is not None
+        assert validator.type == "file"
+
+    def test_parse_unknown_validator(self):
+        """Test that unknown validator types are rejected."""
+        with pytest.raises(ValueError, match="Unknown validator type: bogus"):
+            parse_validator({"type": "bogus"})
+
     def test_parse_none_validator(self):
         """Test parsing None validator config."""
         validator = parse_validator(None)
@@ -250,3 +462,177 @@ categories:
 
             assert "includes" in config.categories
             assert "libraries" in config.categories
+
+    def test_dropin_override_keeps_anchor(self, tmp_path):
+        """Test overriding an aliased node leaves its anchor unchanged."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("""
+themes:
+  dark: &dark {default: white, categories: {includes: blue}}
+  light: *dark
+""")
+        dropin_dir = tmp_path / "conf.d"
+        dropin_dir.mkdir()
+        (dropin_dir / "10.yaml").write_text("themes: {light: {categories: {includes: red}}}\n")
+
+        config = load_config(config_path=config_path, dropin_dir=dropin_dir)
+
+        assert config.themes["dark"].categories == {"includes": "blue"}
+        assert config.themes["light"].categories == {"includes": "red"}
+
+
+class TestLoadDropinDirectory:
+    """Tests for load_dropin_directory function."""
+
+    def test_missing_directory_returns_empty(self, tmp_path):
+        """Test that a missing drop-in directory loads as empty."""
+        assert load_dropin_directory(tmp_path / "conf.d") == {}
+
+    def test_merges_yaml_and_yml_in_name_order(self, tmp_path):
+        """Test that .yaml and .yml files merge in file name order."""
+        (tmp_path / "20-b.yaml").write_text("aliases:\n  q: quit -p\n")
+        (tmp_path / "10-a.yml").write_text("aliases:\n  q: quit\n  lo: lights-off\n")
+        (tmp_path / "30-c.txt").write_text("aliases:\n  q: ignored\n")
+
+        result = load_dropin_directory(tmp_path)
+
+        assert result == {"aliases": {"q": "quit -p", "lo": "lights-off"}}
+
+    def test_many_files_merge_in_order(self, tmp_path):
+        """Test that loading many drop-ins keeps file name order."""
+        for i in range(10):
+            (tmp_path / f"{i:02d}.yaml").write_text(f"aliases:\n  last: cmd-{i}\n")
+
+        first = load_dropin_directory(tmp_path)
+        cached = load_dropin_directory(tmp_path)
+
+        assert first == cached == {"aliases": {"last": "cmd-9"}}
+
+    def test_files_with_document_markers(self, tmp_path):
+        """Test that files with their own document markers still load."""
+        (tmp_path / "10-a.yaml").write_text("---\naliases:\n  q: quit\n")
+        (tmp_path / "20-b.yaml").write_text("")
+        (tmp_path / "30-c.yaml").write_text("aliases:\n  lo: lights-off")
+
+        result = load_dropin_directory(tmp_path)
+
+        assert result == {"aliases": {"q": "quit", "lo": "lights-off"}}
+
+    def test_shared_stream_keeps_files_separate(self, tmp_path):
+        """Test that batch-parsed files produce one document each."""
+        (tmp_path / "10-a.yaml").write_text("# only a comment\n")
+        (tmp_path / "20-b.yaml").write_text("flags:\n  - category: A\n")
+        (tmp_path / "30-c.yaml").write_text("flags:\n  - category: B\n")
+
+        result = load_dropin_directory(tmp_path)
+
+        assert result == {"flags": [{"category": "A"}, {"category": "B"}]}
+
+    def test_override_keeps_anchor(self, tmp_path):
+        """Test a later file overriding an aliased node leaves its anchor unchanged."""
+        (tmp_path / "10-themes.yaml").write_text("""
+themes:
+  dark: &dark {default: white, categories: {includes: blue}}
+  light: *dark
+""")
+        (tmp_path / "20-light.yaml").write_text("themes: {light: {categories: {includes: red}}}\n")
+        (tmp_path / "30-extra.yaml").write_text("themes: {light: {default: black}}\n")
+
+        result = load_dropin_directory(tmp_path)
+
+        assert result["themes"]["dark"] == {"default": "white", "categories": {"includes": "blue"}}
+        assert result["themes"]["light"] == {"default": "black", "categories": {"includes": "red"}}
+
+
+class TestDefaultConfig:
+    """Tests for the built-in default configuration."""
+
+    def test_default_yaml_loads(self):
+        """Test that the built-in defaults parse into a Config."""
+        from prompt_cli.config.defaults import DEFAULT_CONFIG_YAML
+
+        config = load_config_from_string(DEFAULT_CONFIG_YAML)
+
+        assert "includes" in config.categories
+        assert "compiler" in config.category_maps
+        assert config.keybindings["normal"]["ctrl-a"] == "move-line-start"
+
+
+class TestLoadYamlFile:
+    """Tests for load_yaml_file caching."""
+
+    def test_missing_file_returns_empty(self, tmp_path):
+        """Test that a missing file loads as an empty dict."""
+        assert load_yaml_file(tmp_path / "missing.yaml") == {}
+
+    def test_parsed_file_is_cached(self, tmp_path, isolated_cache_dir):
+        """Test that parsing a file populates the cache."""
+        path = tmp_path / "config.yaml"
+        path.write_text("config:\n  color: false\n")
+
+        first = load_yaml_file(path)
+        second = load_yaml_file(path)
+
+        assert first == second == {"config": {"color": False}}
+        assert len(list(isolated_cache_dir.glob("*.pickle"))) == 1
+
+    def test_parse_error_names_file(self, tmp_path):
+        """Test that YAML errors point at the offending file."""
+        path = tmp_path / "broken.yaml"
+        path.write_text("aliases: [q, quit\n")
+
+        with pytest.raises(yaml.YAMLError, match="broken.yaml"):
+            load_yaml_file(path)
+
+    def test_modified_file_is_reparsed(self, tmp_path):
+        """Test that changing a file invalidates its cache entry."""
+        path = tmp_path / "config.yaml"
+        path.write_text("aliases:\n  q: quit\n")
+        load_yaml_file(path)
+
+        path.write_text("aliases:\n  qp: quit -p\n")
+
+        assert load_yaml_file(path) == {"aliases": {"qp": "quit -p"}}
+
+    def test_stale_cache_entries_pruned(self, tmp_path, isolated_cache_dir):
+        """Test that rewriting the cache drops entries for older file states."""
+        path = tmp_path / "config.yaml"
+        other = tmp_path / "other.yaml"
+        other.write_text("aliases:\n  x: exit\n")
+        load_yaml_file(other)
+        for i in range(3):
+            path.write_text(f"aliases:\n  q{i}: quit\n")
+            os.utime(path, ns=(i * 10**9, i * 10**9))
+            load_yaml_file(path)
+
+        assert len(list(isolated_cache_dir.glob("*.pickle"))) == 2
+        assert load_yaml_file(path) == {"aliases": {"q2": "quit"}}
+        assert load_yaml_file(other) == {"aliases": {"x": "exit"}}
+
+    def test_unreadable_cache_entry_is_a_miss(self, tmp_path, isolated_cache_dir):
+        """Test that a corrupt or incompatible cache file is reparsed."""
+        path = tmp_path / "config.yaml"
+        path.write_text("aliases:\n  q: quit\n")
+        load_yaml_file(path)
+
+        [cache_file] = isolated_cache_dir.glob("*.pickle")
+        # A pickle of a class that no longer exists fails with AttributeError
+        cache_file.write_bytes(b"cbuiltins\nMissing\n.")
+
+        assert load_yaml_file(path) == {"aliases": {"q": "quit"}}
+
+
+class TestInternStrings:
+    """Tests for interning strings in loaded config data."""
+
+    def test_interns_keys_and_short_values(self):
+        """Test that keys and short values are interned, in place."""
+        data = {"".join(["cat", "egory"]): ["".join(["bri", "ght"]), {"k": "x" * 40}]}
+
+        result = _intern_strings(data)
+
+        assert result is data
+        key = next(iter(data))
+        assert key is sys.intern("category")
+        assert data[key][0] is sys.intern("bright")
+        assert data[key][1] == {"k": "x" * 40}
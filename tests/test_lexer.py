@@ -2,6 +2,7 @@
 
 import pytest
 
+from prompt_cli.core.tokenizer import tokenize
 from prompt_cli.editor.lexer import CommandLineLexer
 
 
@@ -109,3 +110,92 @@ class TestLexerStyles:
         assert lexer._category_to_class("Includes") == "class:includes"
         assert lexer._category_to_class("ui:duplicates") == "class:ui-duplicates"
         assert lexer._category_to_class("My Category") == "class:my-category"
+
+
+class TestLexDocument:
+    """Tests for lexing documents."""
+
+    def test_same_text_reuses_result(self, sample_config):
+        """Test lexing unchanged text returns the cached line function."""
+        from prompt_toolkit.document import Document
+
+        lexer = CommandLineLexer(sample_config)
+        first = lexer.lex_document(Document("gcc -I/usr/include -O2", 3))
+        second = lexer.lex_document(Document("gcc -I/usr/include -O2", 10))
+
+        assert second is first
+        assert "".join(text for _, text in first(0)) == "gcc -I/usr/include -O2"
+
+    def test_lights_off_change_relexes(self, sample_config):
+        """Test changing lights-off mode produces new styling."""
+        from prompt_toolkit.document import Document
+
+        lexer = CommandLineLexer(sample_config)
+        before = lexer.lex_document(Document("gcc -O2"))(0)
+        lexer.set_lights_off(True)
+        after = lexer.lex_document(Document("gcc -O2"))(0)
+
+        assert after != before
+        assert all(style == "class:lights-off-dim" for style, text in after if text.strip())
+
+    def test_matcher_reused_for_same_executable(self, sample_config):
+        """Test the matcher is only rebuilt when the first token changes."""
+        from prompt_toolkit.document import Document
+
+        lexer = CommandLineLexer(sample_config)
+        lexer.lex_document(Document("gcc -O2"))
+        gcc_matcher = lexer.matcher
+        lexer.lex_document(Document("gcc -O2 -c"))
+        assert lexer.matcher is gcc_matcher
+        assert gcc_matcher.executable == "gcc"
+
+        lexer.lex_document(Document("clang -O2"))
+        assert lexer.matcher.executable == "clang"
+        lexer.lex_document(Document("gcc -O2"))
+        assert lexer.matcher is gcc_matcher
+
+    def test_groups_styled_in_start_order(self, sample_config):
+        """Test groups out of start order are styled left to right."""
+        from prompt_cli.core.matcher import CaptureGroup
+
+        lexer = CommandLineLexer(sample_config)
+        red = lexer.color_parser.parse("red")
+        blue = lexer.color_parser.parse("blue")
+        groups = (CaptureGroup("b", 1, 2, 1), CaptureGroup("a", 0, 1, 2))
+
+        styled: list = []
+        lexer._style_groups(styled, "ab", groups, [red, blue], "Includes")
+
+        assert styled == [
+            (red.to_prompt_toolkit_style(), "a"),
+            (blue.to_prompt_toolkit_style(), "b"),
+        ]
+
+    def test_launcher_compiler_change_restyles(self, sample_config):
+        """Test a reused matcher drops the previous line's compiler flags."""
+        from prompt_toolkit.document import Document
+
+        lexer = CommandLineLexer(sample_config)
+        gcc_line = lexer.lex_document(Document("ccache gcc -march=native"))(0)
+        tool_line = lexer.lex_document(Document("ccache mytool -march=native"))(0)
+
+        fresh = CommandLineLexer(sample_config)
+        expected = fresh.lex_document(Document("ccache mytool -march=native"))(0)
+        assert tool_line == expected
+        assert gcc_line[-1] != expected[-1]
+        results = lexer.matcher.match_tokens(tokenize("ccache mytool -march=native"))
+        assert results[2].category == "Default"
+
+    def test_matcher_cache_is_bounded(self, sample_config):
+        """Test only the most recently used matchers are kept."""
+        from prompt_toolkit.document import Document
+
+        from prompt_cli.editor import lexer as lexer_module
+
+        lexer = CommandLineLexer(sample_config)
+        for i in range(lexer_module._MAX_MATCHERS + 5):
+            lexer.lex_document(Document(f"tool{i} -c"))
+
+        assert len(lexer._matchers) == lexer_module._MAX_MATCHERS
+        assert f"tool{lexer_module._MAX_MATCHERS + 4}" in lexer._matchers
+        assert "tool0" not in lexer._matchers
@@ -1,5 +1,8 @@
 """Tests for the matcher module."""
 
+import dataclasses
+
+import pytest
 
 from prompt_cli.core.matcher import Matcher, expand_category_map
 from prompt_cli.core.tokenizer import tokenize
@@ -62,6 +65,21 @@ class TestMatcher:
         assert results[1].category == "Includes"  # -I/tmp/foo
         assert results[2].category == "Default"  # main.c
 
+    def test_match_tokens_with_launcher(self, sample_config):
+        """Test launcher, launcher argument and compiler categories."""
+        matcher = Matcher(sample_config)
+        tokens = tokenize("time -o out.txt gcc -I/tmp/foo")
+
+        results = matcher.match_tokens(tokens)
+
+        assert [r.category for r in results] == [
+            "Launcher",
+            "LauncherArg",
+            "LauncherArg",
+            "Executable",
+            "Includes",
+        ]
+
     def test_executable_with_preset(self, sample_config):
         """Test that first token is Executable even when executable is preset."""
         matcher = Matcher(sample_config, executable="gcc")
@@ -115,6 +133,17 @@ class TestMatcher:
         assert 1 in equivalents
         assert 4 in equivalents  # Second -I
 
+    def test_category_queries_return_independent_lists(self, sample_config):
+        """Test that indexed results are not shared with callers."""
+        matcher = Matcher(sample_config)
+        results = matcher.match_tokens(tokenize("gcc -I/tmp -o test -I/usr"))
+
+        matcher.get_equivalent_indices(results, 1).clear()
+        matcher.find_duplicates(results)["Includes"].clear()
+
+        assert matcher.get_equivalent_indices(results, 1) == [1, 4]
+        assert matcher.find_duplicates(results) == {"Includes": [1, 4]}
+
 
 class TestExpandCategoryMap:
     """Tests for expand_category_map function."""
@@ -131,6 +160,38 @@ class TestExpandCategoryMap:
 
         assert result == ["Unknown"]
 
+    def test_expand_nested_maps_by_level(self):
+        """Test expanding nested category maps to a given level."""
+        from prompt_cli.config.loader import load_config_from_string
+
+        config = load_config_from_string("""
+category_maps:
+  Compiler: [Paths, Warnings]
+  Paths: [Includes, Libraries]
+""")
+
+        assert expand_category_map(config, "compiler") == ["Includes", "Libraries", "Warnings"]
+        assert expand_category_map(config, "Compiler", 1) == ["Paths", "Warnings"]
+        assert expand_category_map(config, "Compiler", 0) == ["Compiler"]
+
+    def test_expand_cyclic_maps(self):
+        """Test that a map containing itself is not expanded again."""
+        from prompt_cli.config.loader import load_config_from_string
+
+        config = load_config_from_string("""
+category_maps:
+  A: [B, Includes]
+  B: [A, Libraries]
+""")
+
+        assert expand_category_map(config, "A") == ["A", "Libraries", "Includes"]
+
+    def test_expand_result_is_a_copy(self, sample_config):
+        """Test that cached expansions are not shared with callers."""
+        expand_category_map(sample_config, "Includes").append("Other")
+
+        assert expand_category_map(sample_config, "Includes") == ["Includes"]
+
 
 class TestNamedCaptureGroups:
     """Tests for named capture group support."""
@@ -271,3 +332,121 @@ flags:
         assert result.get_group("value").value == "leak"
 
 
+class TestFusedPatterns:
+    """Tests for matching through fused pattern alternations."""
+
+    def test_first_pattern_wins_across_segments(self):
+        """Test match order with fused, split and standalone patterns."""
+        from prompt_cli.config.loader import load_config_from_string
+
+        yaml = r"""
+flags:
+  - category: First
+    regexps:
+      - "(?P<flag>-x)(?P<value>a.*)"
+  - category: Second
+    regexps:
+      - "(?P<flag>-x)(?P<value>.*)"
+      - "-(y)\\1"
+  - category: Third
+    regexps:
+      - "(?i)-Z"
+      - "-(z)(.*)"
+"""
+        config = load_config_from_string(yaml)
+        matcher = Matcher(config)
+
+        def match(value):
+            return matcher.match_token(tokenize(value)[0])
+
+        assert match("-xabc").category == "First"
+        result = match("-xbc")
+        assert result.category == "Second"
+        assert result.get_group_value("value") == "bc"
+        assert match("-yy").category == "Second"
+        assert match("-yz").category == "Default"
+        assert match("-z").category == "Third"
+        result = match("-zed")
+        assert [g.value for g in result.groups] == ["z", "ed"]
+        assert result.groups[1].start == 2
+
+    def test_fused_pattern_without_groups(self):
+        """Test that a group-less fused pattern yields the whole token."""
+        from prompt_cli.config.loader import load_config_from_string
+
+        config = load_config_from_string("""
+flags:
+  - category: Output
+    regexps: ["-(o)(.+)"]
+  - category: Warnings
+    regexps: ["-W[a-z-]+"]
+""")
+        matcher = Matcher(config)
+
+        result = matcher.match_token(tokenize("-Wall")[0])
+
+        assert result.category == "Warnings"
+        assert [(g.value, g.start, g.end, g.group_index) for g in result.groups] == [
+            ("-Wall", 0, 5, 0)
+        ]
+
+
+class TestMatchCache:
+    """Tests for caching match results by token value."""
+
+    def test_repeated_value_uses_live_token(self, sample_config):
+        """Test that a cached match is rebuilt around each token, sharing its groups."""
+        matcher = Matcher(sample_config)
+        tokens = tokenize("-I/tmp -I/tmp")
+
+        first = matcher.match_token(tokens[0])
+        second = matcher.match_token(tokens[1])
+
+        assert second.token is tokens[1]
+        assert second.category == first.category == "Includes"
+        assert second.flag is first.flag
+        assert second.groups is first.groups
+
+    def test_shared_groups_are_immutable(self, sample_config):
+        """Test that cached capture groups cannot be modified."""
+        matcher = Matcher(sample_config)
+
+        result = matcher.match_token(tokenize("-I/tmp")[0])
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.groups[0].value = "changed"
+
+    def test_cache_dropped_when_program_changes(self, sample_config):
+        """Test that program-specific flags apply after find_compiler switches program."""
+        matcher = Matcher(sample_config)
+        assert not matcher.match_token(tokenize("-march=native")[0]).matched
+
+        results = matcher.match_tokens(tokenize("gcc -march=native"))
+
+        assert results[1].matched
+
+
+class TestLiteralPatterns:
+    """Tests for configs whose flag patterns are all literal strings."""
+
+    def test_literal_patterns_match_by_lookup(self):
+        """Test matching, first-pattern precedence and defaults for literals."""
+        from prompt_cli.config.loader import load_config_from_string
+
+        config = load_config_from_string("""
+flags:
+  - category: Color
+    regexps: ["--color", "-G"]
+  - category: Long
+    regexps: ["-l", "--color"]
+""")
+        matcher = Matcher(config)
+
+        def match(value):
+            return matcher.match_token(tokenize(value)[0])
+
+        assert match("--color").category == "Color"
+        assert match("-l").category == "Long"
+        assert match("-la").category == "Default"
+        assert not match("-la").matched
+        assert [(g.value, g.group_index) for g in match("-G").groups] == [("-G", 0)]
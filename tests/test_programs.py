@@ -59,11 +59,24 @@ class TestMatchBuiltin:
         assert _match_builtin("make") == "make"
         assert _match_builtin("cmake") == "cmake"
 
+    def test_earlier_program_wins_across_pattern_types(self):
+        """Test that program order decides between prefix and suffix matches."""
+        # gcc's "-gcc" suffix comes before clang's "clang-" prefix
+        assert _match_builtin("clang-gcc") == "gcc"
+        # gcc's "gcc-" prefix comes before ar's "-ar" suffix
+        assert _match_builtin("gcc-ar") == "gcc"
+        assert _match_builtin("llvm-ar") == "ar"
+
     def test_unknown_program(self):
         """Test unknown program returns None."""
         assert _match_builtin("unknown-compiler") is None
         assert _match_builtin("my-custom-tool") is None
 
+    def test_flag_is_not_a_program(self):
+        """Test that flags never match a builtin suffix."""
+        assert _match_builtin("-gcc") is None
+        assert _match_builtin("-ld") is None
+
 
 class TestMatchConfig:
     """Tests for config-based program matching."""
@@ -84,6 +97,20 @@ class TestMatchConfig:
         # The sample_config has "glob:*-gcc" alias
         assert result == "gcc"
 
+    def test_aliases_match_case_insensitively(self):
+        """Test that glob and regexp aliases ignore case."""
+        from prompt_cli.config.loader import load_config_from_string
+
+        config = load_config_from_string("""
+programs:
+  cross:
+    aliases: ["glob:*-CROSS", "regexp:(t)([0-9]+)x"]
+""")
+
+        assert _match_config("arm-cross", config) == "cross"
+        assert _match_config("T12X", config) == "cross"
+        assert config.get_program("arm-cross") is None
+
     def test_unknown_program(self, sample_config):
         """Test unknown program returns None."""
         result = _match_config("unknown-compiler", sample_config)
@@ -127,6 +154,22 @@ class TestDetectProgram:
         assert result.canonical_name == "my-custom-tool"
         assert result.source == "unknown"
 
+    def test_detect_inline_flag_alias(self):
+        """Test detection through a regexp alias with an inline flag."""
+        from prompt_cli.config.loader import load_config_from_string
+
+        config = load_config_from_string("""
+programs:
+  tool:
+    aliases: ["glob:*-tool", "regexp:(?i)mytool[0-9]*"]
+  other:
+    aliases: ["regexp:other-[0-9]+"]
+""")
+
+        assert detect_program("/opt/MyTool2", config).canonical_name == "tool"
+        assert detect_program("arm-tool", config).canonical_name == "tool"
+        assert detect_program("other-1", config).canonical_name == "other"
+
     def test_detect_without_config(self):
         """Test detection without config uses builtin only."""
         result = detect_program("gcc", None)
@@ -135,6 +178,34 @@ class TestDetectProgram:
         assert result.canonical_name == "gcc"
         assert result.source == "builtin"
 
+    def test_detect_builtin_ignores_case(self):
+        """Test that builtin patterns match regardless of case."""
+        result = detect_program("/usr/bin/LLVM-AR", None)
+
+        assert result.canonical_name == "ar"
+        assert result.matched_name == "LLVM-AR"
+
+    def test_cached_detection_returns_fresh_matches(self, sample_config):
+        """Test that cached detections are not shared between callers."""
+        first = detect_program("arm-linux-gcc", sample_config)
+        first.token_index = 3
+
+        second = detect_program("/opt/arm-linux-gcc", sample_config)
+
+        assert second is not first
+        assert second.token_index == 0
+        assert second.canonical_name == "gcc"
+
+    def test_detection_cache_is_per_config(self):
+        """Test that each config gets its own detections."""
+        from prompt_cli.config.loader import load_config_from_string
+
+        tool_config = load_config_from_string("programs:\n  tool:\n    aliases: [mytool]")
+        empty_config = load_config_from_string("")
+
+        assert detect_program("mytool", tool_config).canonical_name == "tool"
+        assert detect_program("mytool", empty_config).source == "unknown"
+
 
 class TestGetProgramNames:
     """Tests for get_program_names function."""
@@ -163,6 +234,14 @@ class TestGetProgramNames:
 
         assert names == sorted(names)
 
+    def test_cached_names_return_new_lists(self, sample_config):
+        """Test that callers can modify the result without affecting the cache."""
+        names = get_program_names(sample_config)
+        names.append("zzz")
+
+        assert "zzz" not in get_program_names(sample_config)
+        assert get_program_names(sample_config) == names[:-1]
+
 
 class TestIsLauncher:
     """Tests for launcher detection."""
@@ -270,6 +349,26 @@ class TestFindCompiler:
         assert result.token_index == 1
         assert result.launcher.name == "distcc"
 
+    def test_launcher_flag_arguments(self, sample_config):
+        """Test skipping launcher flags with separate and attached arguments."""
+        tokens = self._make_tokens(["scan-build", "-o", "out", "--use-analyzer=clang", "-v", "gcc", "-c"])
+        result = find_compiler(tokens, sample_config)
+
+        assert result is not None
+        assert result.canonical_name == "gcc"
+        assert result.token_index == 5
+        assert result.launcher.args_end_index == 5
+
+    def test_flag_in_program_position_is_unknown(self, sample_config):
+        """Test that a flag in program position is reported as unknown."""
+        tokens = self._make_tokens(["-x-gcc", "foo.c"])
+        result = find_compiler(tokens, sample_config)
+
+        assert result is not None
+        assert result.canonical_name == "-x-gcc"
+        assert result.source == "unknown"
+        assert result.token_index == 0
+
     def test_empty_tokens(self, sample_config):
         """Test with empty token list."""
         result = find_compiler([], sample_config)
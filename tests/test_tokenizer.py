@@ -1,5 +1,8 @@
 """Tests for the tokenizer module."""
 
+import dataclasses
+
+import pytest
 
 from prompt_cli.core.tokenizer import (
     QuoteType,
@@ -108,6 +111,48 @@ class TestTokenize:
         assert tokens[1].end == 15
         assert text[tokens[1].start:tokens[1].end] == '-D"FOO BAR"'
 
+    def test_escaped_whitespace(self):
+        """Test that escaped whitespace does not split a token."""
+        tokens = tokenize(r"ls my\ file a\\b")
+
+        assert [t.value for t in tokens] == ["ls", "my file", "a\\b"]
+        assert tokens[1].raw == r"my\ file"
+
+    def test_quoted_token_ends_at_closing_quote(self):
+        """Test that text right after a quoted token starts a new token."""
+        tokens = tokenize('"a b"c')
+
+        assert [(t.value, t.start, t.end) for t in tokens] == [("a b", 0, 5), ("c", 5, 6)]
+
+    def test_unterminated_quote(self):
+        """Test that an unterminated quote runs to the end of the text."""
+        tokens = tokenize("echo 'it\\'s here")
+
+        assert len(tokens) == 2
+        assert tokens[1].value == "it's here"
+        assert tokens[1].quote_type == QuoteType.SINGLE
+        assert tokens[1].end == len("echo 'it\\'s here")
+
+    def test_unknown_escape_keeps_backslash(self):
+        """Test that backslashes before ordinary characters are kept."""
+        tokens = tokenize(r'a\n "b\n"')
+
+        assert [t.value for t in tokens] == [r"a\n", r"b\n"]
+
+    def test_repeated_text_returns_new_lists(self):
+        """Test that cached results can be modified by the caller."""
+        tokens = tokenize("gcc -c main.c")
+        tokens.pop()
+
+        assert [t.value for t in tokenize("gcc -c main.c")] == ["gcc", "-c", "main.c"]
+
+    def test_tokens_are_immutable(self):
+        """Test that shared tokens cannot be modified."""
+        token = tokenize("gcc")[0]
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            token.value = "clang"
+
 
 class TestDetokenize:
     """Tests for detokenize function."""